@@ -0,0 +1,21 @@
+from django.db.models import Aggregate, CharField
+
+
+class GroupConcat(Aggregate):
+    """
+    Comma-separated concatenation of the values in each group.
+    GROUP_CONCAT on SQLite/MySQL, STRING_AGG on PostgreSQL.
+    """
+    function = 'GROUP_CONCAT'
+    output_field = CharField()
+
+    postgresql_function = 'STRING_AGG'
+    postgresql_template = "%(function)s(CAST(%(expressions)s AS TEXT), ',')"
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        # Aggregate.as_sql() passes its own `template` when compiling a FILTER
+        # clause, so the PostgreSQL spelling goes on a copy rather than in kwargs
+        clone = self.copy()
+        clone.function = self.postgresql_function
+        clone.template = self.postgresql_template
+        return super(GroupConcat, clone).as_sql(compiler, connection, **extra_context)
@@ -1,4 +1,11 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+import json
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 class CustomPageNumberPagination(PageNumberPagination):
@@ -18,4 +25,60 @@ class CustomPageNumberPagination(PageNumberPagination):
                 'previous': self.get_previous_link()
             },
             'results': data
-        })
\ No newline at end of file
+        })
+
+class CursorEnvelopePagination(CursorPagination):
+    """
+    Keyset pagination with the same `pagination`/`results` envelope. Pages are
+    selected with a WHERE on the (indexed) ordering columns instead of OFFSET,
+    so every page costs the same, and no COUNT runs unless asked for:
+    `?count=exact` adds a total cached for PAGINATION_COUNT_CACHE_TIMEOUT, and
+    `?count=estimate` uses the query planner's estimate on Postgres (the cached
+    exact count elsewhere). Subclasses set `ordering`, ending in a unique column.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = self.get_count(queryset, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == 'estimate' and connection.vendor == 'postgresql':
+            return self.estimate_count(queryset)
+        if mode in ('exact', 'estimate'):
+            return self.cached_count(queryset)
+        return None
+
+    def cached_count(self, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        key = 'pagination_count_' + hashlib.sha256(f'{sql}{params!r}'.encode('utf-8')).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, timeout=settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def estimate_count(self, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]['Plan']['Plan Rows']
+
+    def get_paginated_response(self, data):
+        total_pages = math.ceil(self.count / self.page_size) if self.count is not None else None
+        return Response({
+            'pagination': {
+                'count': self.count,
+                'total_pages': total_pages,
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link()
+            },
+            'results': data
+        })
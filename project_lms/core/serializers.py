@@ -0,0 +1,40 @@
+from rest_framework import permissions, serializers
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def requested_fieldset(request):
+    """
+    (fields, omit) named by `?fields=a,b` / `?omit=c` on a read request, each
+    a set of top-level field names or None when the parameter is absent.
+    """
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None, None
+
+    def parse(param):
+        value = request.query_params.get(param, '')
+        names = {name.strip() for name in value.split(',') if name.strip()}
+        return names or None
+
+    return parse(FIELDS_PARAM), parse(OMIT_PARAM)
+
+
+class SparseFieldsMixin:
+    """
+    Limits a serializer to the fields named by `?fields=` and drops those named
+    by `?omit=`. Only the top-level serializer of a response is trimmed; nested
+    serializers always render in full.
+    """
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+        if parent is not None:
+            return fields
+
+        requested, omitted = requested_fieldset(self.context.get('request'))
+        if requested:
+            fields = {name: field for name, field in fields.items() if name in requested}
+        if omitted:
+            fields = {name: field for name, field in fields.items() if name not in omitted}
+        return fields
@@ -1,3 +1,29 @@
+from django.db import connection
+from django.db.models import Q
 from django.test import TestCase
 
-# Create your tests here.
+from enrollment.models import Enrollment
+from .aggregates import GroupConcat
+
+
+class GroupConcatTests(TestCase):
+    """GroupConcat must compile for PostgreSQL, with and without a FILTER clause."""
+
+    def compile_for_postgresql(self, **kwargs):
+        query = Enrollment.objects.values('pk').annotate(
+            done=GroupConcat('lesson_progress__lesson_id', **kwargs)
+        ).query
+        compiler = query.get_compiler(connection=connection)
+        return query.annotations['done'].as_postgresql(compiler, connection)
+
+    def test_compiles_to_string_agg(self):
+        sql, _ = self.compile_for_postgresql()
+        self.assertTrue(sql.startswith('STRING_AGG(CAST('), sql)
+        self.assertTrue(sql.endswith("AS TEXT), ',')"), sql)
+
+    def test_compiles_with_filter(self):
+        # The progress matrix view aggregates with a filter
+        sql, _ = self.compile_for_postgresql(filter=Q(lesson_progress__is_completed=True))
+        self.assertTrue(sql.startswith('STRING_AGG(CAST('), sql)
+        if connection.features.supports_aggregate_filter_clause:
+            self.assertIn('FILTER (WHERE', sql)
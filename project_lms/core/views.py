@@ -1,3 +1,24 @@
-from django.shortcuts import render
+from .serializers import requested_fieldset
 
-# Create your views here.
+
+class SparseFieldsQuerysetMixin:
+    """
+    Keeps model columns behind fields the client left out of `?fields=` /
+    `?omit=` from being read at all. `deferrable_fields` maps a serializer
+    field to the model columns only it needs.
+    """
+    deferrable_fields = {}
+
+    def excluded_fields(self):
+        """Names from `deferrable_fields` that won't be rendered for this request."""
+        requested, omitted = requested_fieldset(self.request)
+        excluded = set()
+        if requested:
+            excluded |= set(self.deferrable_fields) - requested
+        if omitted:
+            excluded |= set(self.deferrable_fields) & omitted
+        return excluded
+
+    def defer_excluded(self, queryset):
+        columns = [column for name in self.excluded_fields() for column in self.deferrable_fields[name]]
+        return queryset.defer(*columns) if columns else queryset
@@ -0,0 +1,42 @@
+"""
+Cached course catalog pages.
+
+Serialized CourseViewSet list pages are cached per audience (public, learner,
+or an individual creator/admin, who also see their own drafts) and URL. All
+keys embed a catalog version that signals bump whenever a Course or Lesson
+is saved or deleted, or a user's role changes (learners only see courses owned
+by creators), so a change invalidates every cached page at once. Without a
+shared cache the bump only reaches the worker that made it, which is why
+COURSE_CATALOG_CACHE_TIMEOUT is short unless REDIS_URL is set.
+"""
+import hashlib
+
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = 'course_catalog_version'
+CATALOG_CACHE_PREFIX = 'course_catalog_'
+
+
+def catalog_version():
+    return cache.get(CATALOG_VERSION_KEY) or 0
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # No version stored yet (or it was evicted)
+        cache.set(CATALOG_VERSION_KEY, catalog_version() + 1, timeout=None)
+
+
+def catalog_audience(user):
+    if user.is_authenticated and (user.is_creator() or user.is_admin()):
+        return f'creator_{user.pk}'
+    if user.is_authenticated and user.is_learner():
+        return 'learner'
+    return 'public'
+
+
+def catalog_cache_key(request):
+    url = hashlib.sha256(request.build_absolute_uri().encode('utf-8')).hexdigest()
+    return f'{CATALOG_CACHE_PREFIX}{catalog_version()}_{catalog_audience(request.user)}_{url}'
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from courses.models import Course, Lesson
+from courses.search import clear_index, course_document, index_documents, lesson_document, search_supported
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index of courses and lessons'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not search_supported():
+            raise CommandError('Full-text search needs SQLite (FTS5) or Postgres.')
+        chunk_size = options['chunk_size']
+
+        with transaction.atomic():
+            clear_index()
+            total = 0
+            for queryset, to_document in (
+                (Course.objects.only('pk', 'title', 'description'), course_document),
+                (Lesson.objects.only('pk', 'course_id', 'title', 'content', 'transcript'), lesson_document),
+            ):
+                batch = []
+                for obj in queryset.order_by('pk').iterator(chunk_size=chunk_size):
+                    batch.append(to_document(obj))
+                    if len(batch) >= chunk_size:
+                        index_documents(batch)
+                        total += len(batch)
+                        batch = []
+                        self.stdout.write(f'Indexed {total} documents')
+                index_documents(batch)
+                total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Done. {total} documents indexed.'))
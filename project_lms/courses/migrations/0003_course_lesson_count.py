@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:13
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_lesson_count(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    Lesson = apps.get_model('courses', 'Lesson')
+    counts = (
+        Lesson.objects.filter(course=OuterRef('pk'))
+        .order_by().values('course').annotate(n=Count('pk')).values('n')
+    )
+    Course.objects.update(lesson_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='lesson_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_lesson_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:15
+
+from django.db import migrations, models
+
+
+def assign_progress_slots(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    Lesson = apps.get_model('courses', 'Lesson')
+    for course in Course.objects.all():
+        lessons = list(Lesson.objects.filter(course=course).order_by('order', 'pk'))
+        for slot, lesson in enumerate(lessons):
+            lesson.progress_slot = slot
+        Lesson.objects.bulk_update(lessons, ['progress_slot'])
+        course.next_progress_slot = len(lessons)
+        course.save(update_fields=['next_progress_slot'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_lesson_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='next_progress_slot',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='progress_slot',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(assign_progress_slots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+from django.utils.html import strip_tags
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE courses_search_index USING fts5("
+    "title, body, course_id UNINDEXED, lesson_id UNINDEXED, tokenize = 'porter unicode61')",
+]
+POSTGRES_CREATE = [
+    "CREATE TABLE courses_search_index ("
+    "id bigint PRIMARY KEY, course_id bigint NOT NULL, lesson_id bigint NULL, "
+    "title text NOT NULL, body text NOT NULL, "
+    "document tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', body), 'B')"
+    ") STORED)",
+    "CREATE INDEX courses_search_index_document ON courses_search_index USING GIN (document)",
+]
+INSERT = "INSERT INTO courses_search_index ({id}, course_id, lesson_id, title, body) VALUES (%s, %s, %s, %s, %s)"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in ('sqlite', 'postgresql'):
+        return
+    Course = apps.get_model('courses', 'Course')
+    Lesson = apps.get_model('courses', 'Lesson')
+    with schema_editor.connection.cursor() as cursor:
+        for statement in (POSTGRES_CREATE if vendor == 'postgresql' else SQLITE_CREATE):
+            cursor.execute(statement)
+
+        # Index existing rows (same document ids as courses.search)
+        documents = [
+            (course.pk * 2, course.pk, None, course.title, strip_tags(course.description or ''))
+            for course in Course.objects.iterator()
+        ]
+        documents += [
+            (lesson.pk * 2 + 1, lesson.course_id, lesson.pk, lesson.title,
+             strip_tags('\n'.join(part for part in (lesson.content, lesson.transcript) if part)))
+            for lesson in Lesson.objects.iterator()
+        ]
+        cursor.executemany(INSERT.format(id='id' if vendor == 'postgresql' else 'rowid'), documents)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS courses_search_index")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_next_progress_slot_lesson_progress_slot'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
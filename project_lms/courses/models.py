@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.conf import settings
 
 class Course(models.Model):
@@ -31,6 +32,10 @@ class Course(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized number of lessons, maintained by Lesson signals with F() updates
+    lesson_count = models.PositiveIntegerField(default=0, editable=False)
+    # Next free bit position for compact enrollment progress (see Lesson.progress_slot)
+    next_progress_slot = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['-created_at']
@@ -57,10 +62,23 @@ class Lesson(models.Model):
         blank=True,
         help_text="Auto-generated text from the content."
     )
+    # Stable bit position of this lesson in Enrollment.progress_bitmap. Slots are
+    # allocated per course and never reused, so reordering or deleting lessons
+    # doesn't shift the bits of other lessons.
+    progress_slot = models.PositiveIntegerField(null=True, blank=True, editable=False)
 
     class Meta:
         unique_together = ('course', 'order')
         ordering = ['order']
 
+    def save(self, *args, **kwargs):
+        if self.progress_slot is None:
+            with transaction.atomic():
+                Course.objects.filter(pk=self.course_id).update(next_progress_slot=F('next_progress_slot') + 1)
+                self.progress_slot = Course.objects.values_list('next_progress_slot', flat=True).get(pk=self.course_id) - 1
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.course.title} - {self.order}. {self.title}"
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Gap-based ordering keys for lessons.
+
+Lesson.order is unique per course, but only its relative order matters, so
+keys are spaced ORDER_GAP apart. Moving a lesson between two neighbours just
+takes the midpoint of their keys, an UPDATE of one row; the course is only
+renumbered when two neighbours have no key left between them.
+
+Renumbering happens in two UPDATEs: every lesson is first shifted above all
+old and new keys, then written to its final key, so no intermediate state
+violates the (course, order) constraint on any database.
+"""
+from django.db import transaction
+from django.db.models import F, Max
+
+from .models import Course, Lesson
+
+ORDER_GAP = 1024
+
+
+def next_lesson_order(course_id):
+    """Key for a lesson appended to the end of the course."""
+    last = Lesson.objects.filter(course_id=course_id).aggregate(last=Max('order'))['last']
+    return (last or 0) + ORDER_GAP
+
+
+def reorder_lessons(course_id, lesson_ids):
+    """
+    Renumber a course's lessons to follow `lesson_ids`, which must list every
+    lesson of the course exactly once. Returns {lesson_id: new order}.
+    """
+    with transaction.atomic():
+        # Serialise reorders/moves of the same course
+        Course.objects.select_for_update().filter(pk=course_id).first()
+        lessons = list(Lesson.objects.filter(course_id=course_id).only('id', 'order'))
+        if len(lesson_ids) != len(set(lesson_ids)) or set(lesson_ids) != {lesson.pk for lesson in lessons}:
+            raise ValueError('lesson_ids must list every lesson of the course exactly once.')
+        if not lessons:
+            return {}
+
+        orders = {lesson_id: position * ORDER_GAP for position, lesson_id in enumerate(lesson_ids, start=1)}
+        offset = max(max(lesson.order for lesson in lessons), len(lessons) * ORDER_GAP) + 1
+        Lesson.objects.filter(course_id=course_id).update(order=F('order') + offset)
+        for lesson in lessons:
+            lesson.order = orders[lesson.pk]
+        Lesson.objects.bulk_update(lessons, ['order'])
+    return orders
+
+
+def move_lesson(lesson, after_id=None, before_id=None):
+    """
+    Place `lesson` directly after the lesson `after_id` or directly before the
+    lesson `before_id` of the same course. Only `lesson` is written unless its
+    new neighbours have adjacent keys, in which case the course is renumbered.
+    Returns the lesson's new order.
+    """
+    course_id = lesson.course_id
+    with transaction.atomic():
+        Course.objects.select_for_update().filter(pk=course_id).first()
+        others = Lesson.objects.filter(course_id=course_id).exclude(pk=lesson.pk)
+        anchor = others.get(pk=after_id if after_id is not None else before_id)
+        if after_id is not None:
+            low = anchor.order
+            high = others.filter(order__gt=low).order_by('order').values_list('order', flat=True).first()
+        else:
+            high = anchor.order
+            low = others.filter(order__lt=high).order_by('-order').values_list('order', flat=True).first() or 0
+
+        if high is None:
+            new_order = low + ORDER_GAP
+        elif high - low > 1:
+            new_order = (low + high) // 2
+        else:
+            # No key left between the neighbours: renumber the whole course
+            ids = list(others.order_by('order').values_list('pk', flat=True))
+            ids.insert(ids.index(anchor.pk) + (1 if after_id is not None else 0), lesson.pk)
+            new_order = reorder_lessons(course_id, ids)[lesson.pk]
+            lesson.order = new_order
+            return new_order
+
+        Lesson.objects.filter(pk=lesson.pk).update(order=new_order)
+    lesson.order = new_order
+    return new_order
@@ -0,0 +1,127 @@
+"""
+Ranked full-text search over courses and lessons.
+
+Every course (title, description) and lesson (title, content, transcript) is
+one document in `courses_search_index`: an FTS5 table on SQLite, or a table
+with a weighted tsvector column and a GIN index on Postgres (both created by
+migration 0005). Signals keep documents current as courses and lessons are
+saved or deleted; `manage.py rebuild_search_index` rebuilds them from scratch.
+
+Snippets are plain text (HTML is stripped when indexing) with matches
+wrapped in <mark>…</mark>.
+"""
+import re
+
+from django.db import connection
+from django.utils.html import strip_tags
+
+SEARCH_TABLE = 'courses_search_index'
+MAX_QUERY_TERMS = 16
+# Title matches count for more than body matches
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+
+def search_supported():
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+# Courses and lessons share one id space in the index
+def course_document_id(course_id):
+    return course_id * 2
+
+
+def lesson_document_id(lesson_id):
+    return lesson_id * 2 + 1
+
+
+def course_document(course):
+    return (course_document_id(course.pk), course.pk, None, course.title, strip_tags(course.description or ''))
+
+
+def lesson_document(lesson):
+    body = '\n'.join(part for part in (lesson.content, lesson.transcript) if part)
+    return (lesson_document_id(lesson.pk), lesson.course_id, lesson.pk, lesson.title, strip_tags(body))
+
+
+def index_documents(documents):
+    """Insert or replace (id, course_id, lesson_id, title, body) documents."""
+    if not documents or not search_supported():
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (id, course_id, lesson_id, title, body) VALUES (%s, %s, %s, %s, %s) "
+                "ON CONFLICT (id) DO UPDATE SET course_id = EXCLUDED.course_id, lesson_id = EXCLUDED.lesson_id, "
+                "title = EXCLUDED.title, body = EXCLUDED.body",
+                documents
+            )
+        else:
+            # FTS5 tables have no upsert; replace by rowid
+            cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(doc[0],) for doc in documents])
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, course_id, lesson_id, title, body) VALUES (%s, %s, %s, %s, %s)",
+                documents
+            )
+
+
+def remove_documents(document_ids):
+    if not document_ids or not search_supported():
+        return
+    id_column = 'id' if connection.vendor == 'postgresql' else 'rowid'
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE {id_column} = %s", [(pk,) for pk in document_ids])
+
+
+def clear_index():
+    if search_supported():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+
+def _fts5_query(query):
+    # Quote every word so user input can't inject FTS5 syntax; each term is a prefix match
+    terms = re.findall(r'\w+', query)[:MAX_QUERY_TERMS]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_documents(query, courses, limit=20):
+    """
+    Best-ranked documents matching `query` whose course is in the `courses`
+    queryset (callers pass their visibility-filtered queryset). Returns dicts
+    with course_id, lesson_id (None for the course itself), title, snippet and score.
+    """
+    visible_sql, visible_params = courses.order_by().values('pk').query.sql_with_params()
+
+    if connection.vendor == 'postgresql':
+        sql = (
+            f"SELECT course_id, lesson_id, title, "
+            f"ts_headline('english', body, query, 'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8'), "
+            f"ts_rank(document, query) AS score "
+            f"FROM {SEARCH_TABLE}, websearch_to_tsquery('english', %s) query "
+            f"WHERE document @@ query AND course_id IN ({visible_sql}) "
+            f"ORDER BY score DESC LIMIT %s"
+        )
+        params = [query, *visible_params, limit]
+    else:
+        match = _fts5_query(query)
+        if not match:
+            return []
+        # bm25() is lower-is-better, so it is negated into a score
+        sql = (
+            f"SELECT course_id, lesson_id, title, "
+            f"snippet({SEARCH_TABLE}, -1, '<mark>', '</mark>', '…', 16), "
+            f"-bm25({SEARCH_TABLE}, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score "
+            f"FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND course_id IN ({visible_sql}) "
+            f"ORDER BY score DESC LIMIT %s"
+        )
+        params = [match, *visible_params, limit]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        {'course_id': course_id, 'lesson_id': lesson_id, 'title': title, 'snippet': snippet, 'score': score}
+        for course_id, lesson_id, title, snippet, score in rows
+    ]
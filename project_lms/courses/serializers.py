@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsMixin
 from .models import Course, Lesson
 
-class LessonSerializer(serializers.ModelSerializer):
+class LessonSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Lesson
         fields = ('id', 'title', 'content', 'order', 'transcript')
@@ -14,10 +15,18 @@ class LessonSerializer(serializers.ModelSerializer):
         # but a basic check is fine here. The unique_together meta handles strict validation.
         return value
 
-class CourseSerializer(serializers.ModelSerializer):
+class LessonOutlineSerializer(serializers.ModelSerializer):
+    """Lesson without its content and transcript, for course outlines."""
+    class Meta:
+        model = Lesson
+        fields = ('id', 'title', 'order')
+        read_only_fields = fields
+
+class CourseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     creator_username = serializers.CharField(source='creator.username', read_only=True)
     status_name = serializers.CharField(source='get_status_display', read_only=True)
-    lesson_count = serializers.SerializerMethodField()
+    # Read from the denormalized Course.lesson_count column instead of a COUNT per row
+    lesson_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Course
@@ -27,15 +36,30 @@ class CourseSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ('creator', 'status',) # Status is set via admin or special endpoint
 
-    def get_lesson_count(self, obj):
-        return obj.lessons.count()
-
 class CourseDetailSerializer(CourseSerializer):
     lessons = LessonSerializer(many=True, read_only=True)
 
     class Meta(CourseSerializer.Meta):
         fields = CourseSerializer.Meta.fields + ('lessons',)
 
+class CourseOutlineSerializer(CourseDetailSerializer):
+    """Course detail with lesson titles only (`?outline=1`)."""
+    lessons = LessonOutlineSerializer(many=True, read_only=True)
+
+class LessonReorderSerializer(serializers.Serializer):
+    """Every lesson id of the course, in the new order."""
+    lesson_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+
+class LessonMoveSerializer(serializers.Serializer):
+    """Where to move a lesson: right after or right before another lesson of the course."""
+    after = serializers.IntegerField(min_value=1, required=False)
+    before = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if ('after' in attrs) == ('before' in attrs):
+            raise serializers.ValidationError("Provide exactly one of 'after' or 'before'.")
+        return attrs
+
 # Transcripts Mock Generation
 class TranscriptMockSerializer(serializers.Serializer):
     """
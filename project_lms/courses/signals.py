@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from enrollment.models import Enrollment
+from enrollment.progress import reconcile_course_completion
+from .catalog import bump_catalog_version
+from .models import Course, Lesson
+from .search import (
+    course_document, course_document_id, index_documents, lesson_document, lesson_document_id, remove_documents
+)
+
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Lesson)
+def invalidate_course_catalog(sender, instance, **kwargs):
+    """Expire every cached catalog page once the change is committed."""
+    # Bumping before commit would let a concurrent request cache the old rows again
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_course_catalog_on_role_change(sender, instance, update_fields=None, **kwargs):
+    """Expire cached catalog pages when a user's role changes, e.g. an approved creator application."""
+    if instance.pk is None or (update_fields is not None and 'role' not in update_fields):
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list('role', flat=True).first()
+    if previous is not None and previous != instance.role:
+        transaction.on_commit(bump_catalog_version)
+
+
+def _reconcile_if_course_exists(course_id):
+    if Course.objects.filter(pk=course_id).exists():
+        reconcile_course_completion(course_id)
+
+
+def shift_lesson_totals(course_id, delta):
+    """Keep Course.lesson_count and every enrollment's lesson total in step."""
+    Course.objects.filter(pk=course_id).update(lesson_count=F('lesson_count') + delta)
+    Enrollment.objects.filter(course_id=course_id).update(
+        total_lessons_snapshot=F('total_lessons_snapshot') + delta
+    )
+    if settings.RECONCILE_COMPLETION_ON_LESSON_CHANGE:
+        # Learners who finished before the change may now be (in)complete
+        transaction.on_commit(lambda: _reconcile_if_course_exists(course_id))
+
+
+def _deleted_with_course(origin):
+    # Counters of a course that is itself being deleted don't need maintaining
+    return isinstance(origin, Course) or getattr(origin, 'model', None) is Course
+
+
+# Lesson counters are maintained here rather than in LessonViewSet so that the
+# admin (LessonAdmin, CourseAdmin's inline) and scripts keep them in step too
+@receiver(post_save, sender=Lesson)
+def count_created_lesson(sender, instance, created, **kwargs):
+    if created:
+        shift_lesson_totals(instance.course_id, 1)
+
+
+@receiver(pre_delete, sender=Lesson)
+def uncount_completed_lesson(sender, instance, origin=None, **kwargs):
+    # Runs before the cascade removes the lesson's LessonProgress rows
+    if _deleted_with_course(origin):
+        return
+    Enrollment.objects.filter(
+        lesson_progress__lesson=instance, lesson_progress__is_completed=True
+    ).update(completed_lessons_count=F('completed_lessons_count') - 1)
+
+
+@receiver(post_delete, sender=Lesson)
+def uncount_deleted_lesson(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_course(origin):
+        shift_lesson_totals(instance.course_id, -1)
+
+
+# Search documents are written in the same transaction as the row they index
+@receiver(post_save, sender=Course)
+def index_course(sender, instance, **kwargs):
+    index_documents([course_document(instance)])
+
+
+@receiver(post_save, sender=Lesson)
+def index_lesson(sender, instance, **kwargs):
+    index_documents([lesson_document(instance)])
+
+
+@receiver(post_delete, sender=Course)
+def unindex_course(sender, instance, **kwargs):
+    # The course's lessons are unindexed by their own (cascaded) post_delete
+    remove_documents([course_document_id(instance.pk)])
+
+
+@receiver(post_delete, sender=Lesson)
+def unindex_lesson(sender, instance, **kwargs):
+    remove_documents([lesson_document_id(instance.pk)])
@@ -2,34 +2,63 @@ import hashlib
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from .models import Course, Lesson
-from .serializers import CourseSerializer, CourseDetailSerializer, LessonSerializer, TranscriptMockSerializer
+from .serializers import (
+    CourseSerializer, CourseDetailSerializer, CourseOutlineSerializer, LessonSerializer, TranscriptMockSerializer,
+    LessonOutlineSerializer, LessonReorderSerializer, LessonMoveSerializer
+)
 from .permissions import IsCreatorOrAdmin
+from .catalog import catalog_cache_key
+from .search import search_documents, search_supported
+from .ordering import next_lesson_order, reorder_lessons, move_lesson
 from core.permissions import IsAdminOrReadOnly # Will be defined in core/permissions.py
-from django.db.models import Q
+from core.views import SparseFieldsQuerysetMixin
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.shortcuts import get_object_or_404
 
 # Simple mock function for transcript generation
 def generate_transcript_mock(content):
     """Mocks an external service call for transcript generation."""
     return f"[TRANSCRIPT MOCK] Analysis of content (len: {len(content)}). Key phrases: {content[:30]}..."
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(SparseFieldsQuerysetMixin, viewsets.ModelViewSet):
     """
     A ViewSet for viewing and editing Course instances.
     CRUD for courses. Public list, restricted write access.
+    Reads accept `?fields=`/`?omit=`, and course detail `?outline=1` for lesson titles only.
     """
     queryset = Course.objects.all().select_related('creator')
     permission_classes = [IsAuthenticated, IsCreatorOrAdmin]
+    deferrable_fields = {'description': ('description',), 'lessons': ()}
+
+    def outline_requested(self):
+        return self.request.query_params.get('outline', '').lower() in ('1', 'true', 'yes')
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
-            return CourseDetailSerializer
+            return CourseOutlineSerializer if self.outline_requested() else CourseDetailSerializer
         return CourseSerializer
 
     def get_queryset(self):
-        # For authenticated users, allow viewing their draft/pending courses
+        qs = self.visible_queryset()
         if self.action in ['list', 'retrieve']:
+            qs = self.defer_excluded(qs)
+        if self.action == 'retrieve' and 'lessons' not in self.excluded_fields():
+            lessons = Lesson.objects.all()
+            if self.outline_requested():
+                # Lesson bodies are unbounded text; an outline never reads them
+                lessons = lessons.only('id', 'course_id', 'title', 'order')
+            qs = qs.prefetch_related(Prefetch('lessons', queryset=lessons))
+        return qs
+
+    def visible_queryset(self):
+        # For authenticated users, allow viewing their draft/pending courses
+        if self.action in ['list', 'retrieve', 'search']:
             user = self.request.user
             # If a creator query param is provided, filter by that creator.
             creator_id = self.request.query_params.get('creator')
@@ -37,26 +66,62 @@ class CourseViewSet(viewsets.ModelViewSet):
                 # Return all courses for the specified creator. The frontend can decide
                 # whether to allow enrollment or not; we expose the full list to learners
                 # so they can view and choose to enroll.
-                qs = self.queryset.filter(creator__id=creator_id)
-                return qs.distinct()
+                return self.queryset.filter(creator_id=creator_id)
 
             # No creator filter: default behavior
             if user.is_authenticated and (user.is_creator() or user.is_admin()):
-                return self.queryset.filter(
-                    Q(status=Course.STATUS_PUBLISHED) | Q(creator=user)
-                ).distinct()
-            # If the user is a learner, let them view all courses created by creators
+                return self.queryset.filter(Q(status=Course.STATUS_PUBLISHED) | Q(creator=user))
+            # If the user is a learner, let them view all courses owned by creators
             if user.is_authenticated and user.is_learner():
-                from django.conf import settings
-                return self.queryset.filter(creator__role=settings.ROLE_CREATOR).distinct()
+                return self.queryset.filter(creator__role=settings.ROLE_CREATOR)
             # Public view: only published courses
             return self.queryset.filter(status=Course.STATUS_PUBLISHED)
         return self.queryset
 
+    def list(self, request, *args, **kwargs):
+        # Serialized pages are cached per audience until a course or lesson changes
+        key = catalog_cache_key(request)
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, timeout=settings.COURSE_CATALOG_CACHE_TIMEOUT)
+        return Response(data)
+
     def perform_create(self, serializer):
         # Automatically set the creator to the authenticated user
         serializer.save(creator=self.request.user)
 
+    @action(detail=False, methods=['GET'])
+    def search(self, request):
+        """
+        Ranked full-text search (`?q=`) over the courses visible to the user and
+        their lessons. Up to `?limit=` (default 20, max 50) courses, each with
+        highlighted snippets of the matching course text and lessons.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'A search query is required.'})
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+        if not search_supported():
+            return Response({'error': 'Search is not available on this database.'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+        # Several documents (course + lessons) can match per course
+        grouped = {}
+        for hit in search_documents(query, self.get_queryset(), limit=limit * 5):
+            entry = grouped.setdefault(hit['course_id'], {'score': round(hit['score'], 4), 'matches': []})
+            entry['matches'].append({'lesson_id': hit['lesson_id'], 'title': hit['title'], 'snippet': hit['snippet']})
+        course_ids = list(grouped)[:limit]
+        courses = self.get_queryset().in_bulk(course_ids)
+
+        results = [
+            {'course': CourseSerializer(courses[course_id]).data, **grouped[course_id]}
+            for course_id in course_ids if course_id in courses
+        ]
+        return Response({'query': query, 'count': len(results), 'results': results})
+
     @action(detail=False, methods=['GET'], url_path='my-courses')
     def my_courses(self, request):
         """List courses created by the authenticated user, regardless of status."""
@@ -65,29 +130,68 @@ class CourseViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class LessonViewSet(viewsets.ModelViewSet):
+class LessonViewSet(SparseFieldsQuerysetMixin, viewsets.ModelViewSet):
     """
     A ViewSet for managing Lessons within a specific Course.
+    Reads accept `?fields=`/`?omit=`; content and transcript are only loaded when rendered.
     """
     serializer_class = LessonSerializer
     # Uses course permission since lesson management is tied to course ownership
     permission_classes = [IsAuthenticated, IsCreatorOrAdmin]
+    deferrable_fields = {'content': ('content',), 'transcript': ('transcript',)}
 
     def get_queryset(self):
         # Lessons are always filtered by the course_pk in the URL
-        return Lesson.objects.filter(course_id=self.kwargs['course_pk'])
+        return self.defer_excluded(Lesson.objects.filter(course_id=self.kwargs['course_pk']))
 
     def perform_create(self, serializer):
         course = Course.objects.get(pk=self.kwargs['course_pk'])
         # Check permission that the user owns the course
-        if course.creator != self.request.user and not self.request.user.is_admin():
+        self.check_course_owner(course)
+
+        # Set the course and append after the last lesson, leaving a gap for later moves.
+        # Lesson counters are kept in step by the signals in courses/signals.py.
+        with transaction.atomic():
+            serializer.save(course=course, order=next_lesson_order(course.pk))
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+
+    def check_course_owner(self, course):
+        if course.creator_id != self.request.user.id and not self.request.user.is_admin():
             self.permission_denied(self.request, message="You are not the creator of this course.")
 
-        # Set the course and determine the next order
-        last_lesson = Lesson.objects.filter(course=course).order_by('-order').first()
-        next_order = (last_lesson.order if last_lesson else 0) + 1
+    @action(detail=False, methods=['post'])
+    def reorder(self, request, course_pk=None):
+        """Apply a full new lesson order (`{"lesson_ids": [...]}`) in one transaction."""
+        course = get_object_or_404(Course, pk=course_pk)
+        self.check_course_owner(course)
+        payload = LessonReorderSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        try:
+            reorder_lessons(course.pk, payload.validated_data['lesson_ids'])
+        except ValueError as exc:
+            raise ValidationError({'lesson_ids': str(exc)})
+        lessons = Lesson.objects.filter(course=course).only('id', 'course_id', 'title', 'order')
+        return Response(LessonOutlineSerializer(lessons, many=True).data)
 
-        serializer.save(course=course, order=next_order)
+    @action(detail=True, methods=['post'])
+    def move(self, request, course_pk=None, pk=None):
+        """Move one lesson right after (`{"after": id}`) or before (`{"before": id}`) another."""
+        lesson = self.get_object()
+        self.check_course_owner(lesson.course)
+        payload = LessonMoveSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        try:
+            move_lesson(
+                lesson,
+                after_id=payload.validated_data.get('after'),
+                before_id=payload.validated_data.get('before'),
+            )
+        except Lesson.DoesNotExist:
+            raise ValidationError({'detail': 'The other lesson must be a different lesson of the same course.'})
+        return Response(LessonOutlineSerializer(lesson).data)
 
     @action(detail=True, methods=['post'])
     def generate_transcript(self, request, course_pk=None, pk=None):
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CreatorApplication
+from .models import CreatorApplication, LessonFunnelRollup
 
 
 @admin.register(CreatorApplication)
@@ -8,3 +8,10 @@ class CreatorApplicationAdmin(admin.ModelAdmin):
 	list_filter = ('status',)
 	search_fields = ('applicant__username',)
 	readonly_fields = ('applied_at',)
+
+
+@admin.register(LessonFunnelRollup)
+class LessonFunnelRollupAdmin(admin.ModelAdmin):
+	list_display = ('course', 'lesson', 'day', 'completions')
+	list_filter = ('course',)
+	date_hierarchy = 'day'
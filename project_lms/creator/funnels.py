@@ -0,0 +1,151 @@
+"""
+Per-course lesson drop-off funnels served from precomputed daily rollups.
+
+refresh_lesson_funnels() recounts the (lesson, day) buckets of LessonFunnelRollup
+touched by LessonProgress rows recorded since the stored watermark, plus the
+buckets marked stale by deleted progress, so dashboards never scan the whole
+progress table. The watermark follows the server-side `recorded_at` rather
+than the client-reported `completed_at`, so offline completions dated far in
+the past are still picked up.
+
+Served funnels are cached per course. A refresh deletes the entries of the
+courses it changed, which only reaches the web workers through a shared cache
+(REDIS_URL); otherwise FUNNEL_CACHE_TIMEOUT alone bounds how stale they get.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from enrollment.models import Enrollment, LessonProgress
+from .models import FunnelWatermark, LessonFunnelRollup
+
+FUNNEL_WATERMARK_NAME = 'lesson_funnel'
+FUNNEL_CACHE_PREFIX = 'lesson_funnel_'
+# Rows recorded just before a refresh may commit after it has read, so every
+# refresh re-reads this much history before the watermark.
+FUNNEL_REFRESH_LOOKBACK = timedelta(minutes=5)
+
+
+def _funnel_cache_key(course_id):
+    return f"{FUNNEL_CACHE_PREFIX}{course_id}"
+
+
+def refresh_lesson_funnels(full=False):
+    """
+    Bring the rollups up to date. With `full`, every bucket is rebuilt.
+    Returns (buckets written, watermark).
+    """
+    upper = timezone.now()
+    with transaction.atomic():
+        watermark, _ = FunnelWatermark.objects.select_for_update().get_or_create(name=FUNNEL_WATERMARK_NAME)
+
+        completed = LessonProgress.objects.filter(is_completed=True, completed_at__isnull=False)
+        if full:
+            LessonFunnelRollup.objects.all().delete()
+            buckets = completed.annotate(day=TruncDate('completed_at'))
+            lesson_ids = days = None
+        else:
+            # Include rows no longer completed: their old bucket has to shrink
+            recorded = LessonProgress.objects.filter(completed_at__isnull=False, recorded_at__lte=upper)
+            if watermark.recorded_through:
+                recorded = recorded.filter(recorded_at__gt=watermark.recorded_through - FUNNEL_REFRESH_LOOKBACK)
+            touched = set(
+                recorded.annotate(day=TruncDate('completed_at')).values_list('lesson_id', 'day').distinct()
+            )
+            touched |= set(
+                LessonFunnelRollup.objects.select_for_update().filter(stale=True).values_list('lesson_id', 'day')
+            )
+            lesson_ids = {lesson_id for lesson_id, _ in touched}
+            days = {day for _, day in touched}
+            # Recount whole buckets rather than adding deltas, so overlapping refreshes stay exact
+            buckets = (
+                completed.filter(
+                    lesson_id__in=lesson_ids,
+                    # Range on the indexed column first, then exact days
+                    completed_at__gte=timezone.make_aware(datetime.combine(min(days), time.min)),
+                    completed_at__lt=timezone.make_aware(datetime.combine(max(days) + timedelta(days=1), time.min)),
+                )
+                .annotate(day=TruncDate('completed_at'))
+                .filter(day__in=days)
+            ) if touched else None
+
+        rows = [
+            LessonFunnelRollup(
+                course_id=bucket['lesson__course_id'], lesson_id=bucket['lesson_id'],
+                day=bucket['day'], completions=bucket['n'], stale=False
+            )
+            for bucket in buckets.values('lesson__course_id', 'lesson_id', 'day').annotate(n=Count('pk')).order_by()
+        ] if buckets is not None else []
+
+        emptied = []
+        if lesson_ids:
+            # Recounted buckets that no longer have any completions
+            counted = {(row.lesson_id, row.day) for row in rows}
+            emptied = [
+                (pk, course_id)
+                for pk, course_id, lesson_id, day in LessonFunnelRollup.objects.filter(
+                    lesson_id__in=lesson_ids, day__in=days
+                ).values_list('pk', 'course_id', 'lesson_id', 'day')
+                if (lesson_id, day) not in counted
+            ]
+            LessonFunnelRollup.objects.filter(pk__in=[pk for pk, _ in emptied]).delete()
+
+        LessonFunnelRollup.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['course', 'lesson', 'day'],
+            update_fields=['completions', 'stale'],
+        )
+
+        watermark.recorded_through = upper
+        watermark.save()
+
+    changed = {row.course_id for row in rows} | {course_id for _, course_id in emptied}
+    cache.delete_many([_funnel_cache_key(course_id) for course_id in changed])
+    return len(rows) + len(emptied), upper
+
+
+def course_funnel(course):
+    """Funnel for `course`: per lesson (in order) how many learners reached it and how many dropped off."""
+    key = _funnel_cache_key(course.pk)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    reached = dict(
+        LessonFunnelRollup.objects.filter(course=course)
+        .values('lesson_id').annotate(total=Sum('completions'))
+        .values_list('lesson_id', 'total')
+    )
+    enrolled = Enrollment.objects.filter(course=course).count()
+    watermark = FunnelWatermark.objects.filter(name=FUNNEL_WATERMARK_NAME).values_list(
+        'recorded_through', flat=True
+    ).first()
+
+    lessons = []
+    previous = enrolled
+    for lesson in course.lessons.values('id', 'title', 'order'):
+        count = reached.get(lesson['id'], 0)
+        lessons.append({
+            'lesson_id': lesson['id'],
+            'title': lesson['title'],
+            'order': lesson['order'],
+            'reached': count,
+            'reached_percent': round(100.0 * count / enrolled, 1) if enrolled else 0.0,
+            'drop_off': max(previous - count, 0),
+        })
+        previous = count
+
+    data = {
+        'course_id': course.pk,
+        'enrolled': enrolled,
+        'refreshed_through': watermark,
+        'lessons': lessons,
+    }
+    cache.set(key, data, timeout=settings.FUNNEL_CACHE_TIMEOUT)
+    return data
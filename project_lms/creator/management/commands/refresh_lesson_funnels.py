@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+from creator.funnels import refresh_lesson_funnels
+
+
+class Command(BaseCommand):
+    help = 'Fold newly recorded or deleted lesson progress into the per-course funnel rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every rollup bucket from scratch')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        written, watermark = refresh_lesson_funnels(full=options['full'])
+        self.stdout.write(
+            f'Refreshed {written} funnel buckets through {watermark.isoformat()} '
+            f'in {time.monotonic() - started:.2f}s'
+        )
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_next_progress_slot_lesson_progress_slot'),
+        ('creator', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FunnelWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('completed_through', models.DateTimeField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LessonFunnelRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('completions', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='funnel_rollups', to='courses.course')),
+                ('lesson', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='funnel_rollups', to='courses.lesson')),
+            ],
+            options={
+                'unique_together': {('course', 'lesson', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator', '0003_funnelwatermark_lessonfunnelrollup'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='funnelwatermark',
+            old_name='completed_through',
+            new_name='recorded_through',
+        ),
+        migrations.AddField(
+            model_name='lessonfunnelrollup',
+            name='stale',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from courses.models import Course, Lesson
 
 class CreatorApplication(models.Model):
     """
@@ -37,4 +38,44 @@ class CreatorApplication(models.Model):
     )
 
     def __str__(self):
-        return f"Application from {self.applicant.username} ({self.get_status_display()})"
\ No newline at end of file
+        return f"Application from {self.applicant.username} ({self.get_status_display()})"
+
+
+class LessonFunnelRollup(models.Model):
+    """
+    Number of learners who completed a lesson on a given day. Maintained
+    incrementally by `manage.py refresh_lesson_funnels` (see creator/funnels.py).
+    """
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='funnel_rollups'
+    )
+    lesson = models.ForeignKey(
+        Lesson,
+        on_delete=models.CASCADE,
+        related_name='funnel_rollups'
+    )
+    day = models.DateField()
+    completions = models.PositiveIntegerField(default=0)
+    # Set when progress counted here is deleted; the next refresh recounts it
+    stale = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ('course', 'lesson', 'day')
+
+    def __str__(self):
+        return f"{self.lesson} on {self.day}: {self.completions}"
+
+
+class FunnelWatermark(models.Model):
+    """
+    How far the funnel rollups have been refreshed: progress recorded at or
+    before `recorded_through` (LessonProgress.recorded_at) is already counted.
+    """
+    name = models.CharField(max_length=64, unique=True)
+    recorded_through = models.DateTimeField(null=True, blank=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} through {self.recorded_through}"
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from courses.models import Course, Lesson
+from enrollment.models import LessonProgress
+from .models import LessonFunnelRollup
+
+
+@receiver(post_delete, sender=LessonProgress)
+def mark_funnel_bucket_stale(sender, instance, origin=None, **kwargs):
+    """Have the next funnel refresh recount the bucket a deleted completion was counted in."""
+    # Rollups of a deleted course or lesson go with it
+    if isinstance(origin, (Course, Lesson)) or getattr(origin, 'model', None) in (Course, Lesson):
+        return
+    if not instance.is_completed or instance.completed_at is None:
+        return
+    LessonFunnelRollup.objects.filter(
+        lesson_id=instance.lesson_id, day=timezone.localdate(instance.completed_at)
+    ).update(stale=True)
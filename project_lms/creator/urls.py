@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import ApplyCreatorView, CreatorDashboardView
+from .views import ApplyCreatorView, CreatorDashboardView, CourseFunnelView
 
 urlpatterns = [
     path('apply/', ApplyCreatorView.as_view(), name='creator-apply'),
     path('dashboard/', CreatorDashboardView.as_view(), name='creator-dashboard'),
+    path('courses/<int:course_id>/funnel/', CourseFunnelView.as_view(), name='creator-course-funnel'),
 ]
\ No newline at end of file
@@ -3,8 +3,10 @@ from rest_framework.response import Response
 from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
 
+from rest_framework.exceptions import PermissionDenied
 from .models import CreatorApplication
 from .serializers import CreatorApplicationSerializer
+from .funnels import course_funnel
 from courses.models import Course
 
 class IsLearner(permissions.BasePermission):
@@ -51,4 +53,17 @@ class CreatorDashboardView(generics.GenericAPIView):
             'draft_courses': user_courses.filter(status=Course.STATUS_DRAFT).count(),
             # Add more metrics like total enrollments, etc.
         }
-        return Response(data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(data, status=status.HTTP_200_OK)
+
+class CourseFunnelView(generics.GenericAPIView):
+    """
+    Lesson drop-off funnel for one of the creator's courses, served from the
+    precomputed daily rollups (refreshed by `manage.py refresh_lesson_funnels`).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, course_id, *args, **kwargs):
+        course = get_object_or_404(Course, pk=course_id)
+        if not (course.creator_id == request.user.id or request.user.is_admin()):
+            raise PermissionDenied('You do not have permission to view the funnel for this course.')
+        return Response(course_funnel(course), status=status.HTTP_200_OK)
@@ -18,5 +18,5 @@ class LessonProgressAdmin(admin.ModelAdmin):
 
 @admin.register(Certificate)
 class CertificateAdmin(admin.ModelAdmin):
-	list_display = ('enrollment', 'serial_hash', 'issued_at')
-	search_fields = ('serial_hash', 'enrollment__learner__username', 'enrollment__course__title')
+	list_display = ('enrollment', 'serial_hash', 'short_code', 'issued_at')
+	search_fields = ('serial_hash', 'short_code', 'enrollment__learner__username', 'enrollment__course__title')
@@ -0,0 +1,93 @@
+"""
+Streaming exports of course progress and enrollments.
+
+Rows are read with values_list() + iterator(chunk_size=...) so no model
+instances are built and memory stays flat no matter how many rows a course
+has; the CSV/NDJSON encoders are generators suitable for StreamingHttpResponse.
+"""
+import csv
+import json
+from datetime import datetime
+
+from .models import Enrollment, LessonProgress
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_KINDS = {
+    'progress': (
+        LessonProgress,
+        'enrollment__course_id',
+        (
+            ('enrollment_id', 'enrollment_id'),
+            ('learner_id', 'enrollment__learner_id'),
+            ('learner_username', 'enrollment__learner__username'),
+            ('lesson_id', 'lesson_id'),
+            ('lesson_order', 'lesson__order'),
+            ('lesson_title', 'lesson__title'),
+            ('is_completed', 'is_completed'),
+            ('completed_at', 'completed_at'),
+            ('last_position', 'last_position'),
+        ),
+    ),
+    'enrollments': (
+        Enrollment,
+        'course_id',
+        (
+            ('enrollment_id', 'id'),
+            ('learner_id', 'learner_id'),
+            ('learner_username', 'learner__username'),
+            ('enrolled_at', 'enrolled_at'),
+            ('completed_lessons', 'completed_lessons_count'),
+            ('total_lessons', 'total_lessons_snapshot'),
+            ('is_completed', 'is_completed'),
+            ('completion_date', 'completion_date'),
+        ),
+    ),
+}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def export_rows(course_id, kind):
+    """Return (column names, lazy iterator of row tuples) for one course."""
+    model, course_lookup, columns = EXPORT_KINDS[kind]
+    rows = (
+        model.objects.filter(**{course_lookup: course_id})
+        .order_by('pk')
+        .values_list(*[lookup for _, lookup in columns])
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    return [name for name, _ in columns], rows
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+    def write(self, value):
+        return value
+
+
+def stream_csv(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_plain(value) for value in row])
+
+
+def stream_ndjson(columns, rows):
+    for row in rows:
+        yield json.dumps({name: _plain(value) for name, value in zip(columns, row)}) + '\n'
+
+
+def stream_export(course_id, kind, fmt):
+    """Generator of encoded export chunks (str) for `kind` in format `fmt`."""
+    columns, rows = export_rows(course_id, kind)
+    if fmt == 'ndjson':
+        return stream_ndjson(columns, rows)
+    return stream_csv(columns, rows)
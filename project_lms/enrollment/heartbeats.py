@@ -0,0 +1,114 @@
+"""
+Write-coalescing buffer for in-lesson position heartbeats.
+
+Heartbeats only overwrite the latest position per (enrollment, lesson) in
+settings.HEARTBEAT_BUFFER: a Redis hash when REDIS_URL is set, an in-process
+dict otherwise. flush_heartbeats() upserts whatever is buffered into
+LessonProgress.last_position in one statement, so database writes scale with
+the flush interval rather than with heartbeat frequency.
+
+With Redis every heartbeat is a single HSET, atomic across web workers. A
+flush RENAMEs the hash to a drain key, so heartbeats arriving meanwhile start
+a fresh hash, and deletes the drain key only once its positions are written.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+from courses.models import Lesson
+from .models import Enrollment, LessonProgress
+
+HEARTBEAT_HASH_KEY = "heartbeat_positions"
+HEARTBEAT_DRAIN_KEY = "heartbeat_positions_draining"
+
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def _uses_cache(buffer):
+    return not isinstance(buffer, dict)
+
+
+def _redis():
+    # Raw client of the default (django-redis) cache, for the hash commands
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def record_heartbeat(enrollment_id, lesson_id, position):
+    """Buffer the latest `position` for a lesson; older buffered values are dropped."""
+    global _last_flush
+    buffer = settings.HEARTBEAT_BUFFER
+
+    if _uses_cache(buffer):
+        _redis().hset(HEARTBEAT_HASH_KEY, f"{enrollment_id}:{lesson_id}", position)
+        return
+
+    with _lock:
+        buffer[(enrollment_id, lesson_id)] = position
+        due = time.monotonic() - _last_flush >= settings.HEARTBEAT_FLUSH_INTERVAL
+        if due:
+            _last_flush = time.monotonic()
+    # Nothing outside this process can see the dict, so it flushes itself
+    if due:
+        flush_heartbeats()
+
+
+def _drain():
+    """Take everything buffered as {(enrollment_id, lesson_id): position}."""
+    buffer = settings.HEARTBEAT_BUFFER
+    if not _uses_cache(buffer):
+        with _lock:
+            positions = dict(buffer)
+            buffer.clear()
+        return positions
+
+    from redis.exceptions import ResponseError
+    client = _redis()
+    # A drain key left by a failed flush is written first; RENAME would overwrite it
+    if not client.exists(HEARTBEAT_DRAIN_KEY):
+        try:
+            client.rename(HEARTBEAT_HASH_KEY, HEARTBEAT_DRAIN_KEY)
+        except ResponseError:
+            # Nothing buffered since the last flush
+            return {}
+    positions = {}
+    for field, position in client.hgetall(HEARTBEAT_DRAIN_KEY).items():
+        enrollment_id, lesson_id = field.decode().split(':')
+        positions[(int(enrollment_id), int(lesson_id))] = float(position)
+    return positions
+
+
+def _acknowledge():
+    """Forget the drained positions once they are in the database."""
+    if _uses_cache(settings.HEARTBEAT_BUFFER):
+        _redis().delete(HEARTBEAT_DRAIN_KEY)
+
+
+def flush_heartbeats():
+    """Upsert buffered positions into LessonProgress. Returns the number of rows written."""
+    positions = _drain()
+    if not positions:
+        return 0
+
+    # Skip anything deleted since the heartbeat was buffered
+    enrollment_ids = set(Enrollment.objects.filter(
+        pk__in={enrollment_id for enrollment_id, _ in positions}
+    ).values_list('pk', flat=True))
+    lesson_ids = set(Lesson.objects.filter(
+        pk__in={lesson_id for _, lesson_id in positions}
+    ).values_list('pk', flat=True))
+    rows = [
+        LessonProgress(enrollment_id=enrollment_id, lesson_id=lesson_id, last_position=position)
+        for (enrollment_id, lesson_id), position in positions.items()
+        if enrollment_id in enrollment_ids and lesson_id in lesson_ids
+    ]
+    LessonProgress.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['enrollment', 'lesson'],
+        update_fields=['last_position'],
+    )
+    _acknowledge()
+    return len(rows)
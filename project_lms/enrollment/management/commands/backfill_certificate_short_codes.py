@@ -0,0 +1,32 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from enrollment.models import Certificate, certificate_html_cache_key
+
+
+class Command(BaseCommand):
+    help = 'Assign short codes to certificates issued before they existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        qs = Certificate.objects.filter(short_code__isnull=True).exclude(serial_hash='').order_by('pk')
+        chunk_size = options['chunk_size']
+
+        last_pk = 0
+        total = 0
+        while True:
+            certificates = list(qs.filter(pk__gt=last_pk).only('pk', 'serial_hash')[:chunk_size])
+            if not certificates:
+                break
+            last_pk = certificates[-1].pk
+
+            for certificate in certificates:
+                certificate.short_code = certificate.generate_short_code()
+            Certificate.objects.bulk_update(certificates, ['short_code'])
+            # The printed id changes, so cached HTML renders are stale
+            cache.delete_many([certificate_html_cache_key(certificate.serial_hash) for certificate in certificates])
+            total += len(certificates)
+            self.stdout.write(f'Assigned {total} short codes (last id={last_pk})')
+
+        self.stdout.write(self.style.SUCCESS(f'Done. {total} certificates updated.'))
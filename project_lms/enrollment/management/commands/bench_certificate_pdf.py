@@ -0,0 +1,97 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from enrollment import pdf
+
+
+def render_before(certificate):
+    """The renderer as it was before the ASCII85/initial-font changes, kept as the baseline."""
+    buffer = io.BytesIO()
+    page_size = pdf.landscape(pdf.A4)
+    c = pdf.canvas.Canvas(buffer, pagesize=page_size)
+    width, height = page_size
+
+    c.setFillColor(pdf.HexColor('#0ea5e9'))
+    c.setFont('Times-Bold', 36)
+    c.drawCentredString(width/2, height - 100, certificate.title or 'Certificate of Completion')
+
+    c.setFillColor(pdf.HexColor('#111827'))
+    c.setFont('Times-Roman', 14)
+    c.drawCentredString(width/2, height - 140, 'This is to certify that')
+
+    c.setFont('Times-Bold', 32)
+    c.drawCentredString(width/2, height - 190, certificate.recipient_name or '')
+
+    c.setFont('Times-Roman', 16)
+    course_line = certificate.course_title or ''
+    if certificate.course_code:
+        course_line = f"{course_line} ({certificate.course_code})"
+    c.drawCentredString(width/2, height - 230, f"has successfully completed the course: {course_line}")
+
+    c.setFont('Times-Roman', 12)
+    left_x = 80
+    right_x = width - 80
+    c.drawString(left_x, height - 300, f"Date of completion: {certificate.issued_at.strftime('%B %d, %Y') if certificate.issued_at else ''}")
+    if certificate.duration_hours:
+        c.drawString(left_x, height - 320, f"Duration: {certificate.duration_hours}")
+    if certificate.grade:
+        c.drawString(left_x, height - 340, f"Achievement: {certificate.grade}")
+
+    c.drawRightString(right_x, height - 300, f"Issued by: {certificate.issuer_name}")
+    c.drawRightString(right_x, height - 320, f"Certificate ID: {certificate.serial_hash}")
+
+    sig_y = height - 420
+    c.line(left_x, sig_y, left_x + 220, sig_y)
+    c.drawString(left_x, sig_y - 14, certificate.signature_text or '(Signature) — Instructor')
+
+    c.line(right_x - 220, sig_y, right_x, sig_y)
+    c.drawString(right_x - 220, sig_y - 14, 'Director — Krishna')
+
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = 'Micro-benchmark of certificate PDF rendering against the previous renderer (time and size per certificate)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=1000, help='Renders per round')
+        parser.add_argument('--rounds', type=int, default=5, help='Alternating rounds; the median is reported')
+
+    def sample(self):
+        return pdf.CertificateData(
+            serial_hash='0' * 64, title='Certificate of Completion', recipient_name='Ada Lovelace',
+            course_title='Introduction to Algorithms', course_code='CS101', issuer_name='Skillion',
+            issued_at=timezone.now(), duration_hours='12 hours', grade='Distinction', signature_text='',
+        )
+
+    def time_per_call(self, fn, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return (time.perf_counter() - started) / iterations * 1000
+
+    def handle(self, *args, **options):
+        if not pdf.REPORTLAB_AVAILABLE:
+            raise CommandError('ReportLab is not installed.')
+        data = self.sample()
+        renderers = {'previous renderer': render_before, 'render_certificate_pdf_bytes': pdf.render_certificate_pdf_bytes}
+
+        # Alternate the renderers so warm-up and machine noise hit both alike
+        timings = {name: [] for name in renderers}
+        sizes = {name: len(render(data)) for name, render in renderers.items()}
+        for _ in range(options['rounds']):
+            for name, render in renderers.items():
+                timings[name].append(self.time_per_call(lambda: render(data), options['iterations']))
+        medians = {name: sorted(values)[len(values) // 2] for name, values in timings.items()}
+
+        before, after = medians['previous renderer'], medians['render_certificate_pdf_bytes']
+        for name in renderers:
+            self.stdout.write(f'{name + ":":30} {medians[name]:.3f} ms/certificate, {sizes[name]} bytes')
+        self.stdout.write(
+            f'{(1 - after / before) * 100:.0f}% faster, '
+            f'{(1 - sizes["render_certificate_pdf_bytes"] / sizes["previous renderer"]) * 100:.0f}% smaller'
+        )
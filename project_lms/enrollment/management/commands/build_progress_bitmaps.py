@@ -0,0 +1,44 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from enrollment.models import Enrollment, LessonProgress
+from enrollment.progress import set_bits
+
+
+class Command(BaseCommand):
+    help = 'Build (or rebuild) the compact progress bitmap of enrollments from their LessonProgress rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, help='Only rebuild enrollments of this course id')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        qs = Enrollment.objects.order_by('pk')
+        if options['course']:
+            qs = qs.filter(course_id=options['course'])
+        chunk_size = options['chunk_size']
+
+        last_pk = 0
+        total = 0
+        while True:
+            enrollments = list(qs.filter(pk__gt=last_pk).only('pk')[:chunk_size])
+            if not enrollments:
+                break
+            last_pk = enrollments[-1].pk
+
+            completions = defaultdict(dict)
+            rows = LessonProgress.objects.filter(
+                enrollment__in=enrollments, is_completed=True, lesson__progress_slot__isnull=False
+            ).values_list('enrollment_id', 'lesson__progress_slot', 'completed_at')
+            for enrollment_id, slot, completed_at in rows:
+                completions[enrollment_id][slot] = completed_at
+
+            for enrollment in enrollments:
+                enrollment.progress_bitmap, enrollment.progress_timestamps = set_bits(
+                    b'', [], completions.get(enrollment.pk, {})
+                )
+            Enrollment.objects.bulk_update(enrollments, ['progress_bitmap', 'progress_timestamps'])
+            total += len(enrollments)
+            self.stdout.write(f'Rebuilt {total} enrollments (last id={last_pk})')
+
+        self.stdout.write(self.style.SUCCESS(f'Done. {total} enrollment bitmaps rebuilt.'))
@@ -29,6 +29,8 @@ class Command(BaseCommand):
         if course.lessons.count() == 0:
             for i in range(1,4):
                 Lesson.objects.create(course=course, title=f'Lesson {i}', content='Demo', order=i)
+        Course.objects.filter(pk=course.pk).update(lesson_count=course.lessons.count())
+        course.refresh_from_db(fields=['lesson_count'])
 
         # Enroll learner
         enrollment, created = Enrollment.objects.get_or_create(learner=learner, course=course)
@@ -45,16 +47,15 @@ class Command(BaseCommand):
         # Mark enrollment completed
         enrollment.is_completed = True
         enrollment.completion_date = timezone.now()
+        enrollment.total_lessons_snapshot = course.lesson_count
+        enrollment.completed_lessons_count = course.lesson_count
         enrollment.save()
 
         # Issue certificate
         if not hasattr(enrollment, 'certificate'):
             cert = Certificate.objects.create(enrollment=enrollment)
-            # Ensure serial_hash generated by model save() is available by reloading
-            cert.refresh_from_db()
         else:
             cert = enrollment.certificate
-            cert.refresh_from_db()
 
         self.stdout.write('Certificate serial_hash: ' + (cert.serial_hash or ''))
         self.stdout.write('Render URL: http://127.0.0.1:8000/api/v1/enrollment/certificate/render/' + (cert.serial_hash or '') + '/')
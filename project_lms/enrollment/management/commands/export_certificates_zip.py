@@ -0,0 +1,48 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from enrollment.models import Certificate
+from enrollment.pdf import REPORTLAB_AVAILABLE, certificate_data_rows, iter_certificate_archive
+
+
+class Command(BaseCommand):
+    help = 'Render certificate PDFs in parallel into a single ZIP archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Path of the ZIP file to write')
+        parser.add_argument('--course', type=int, help='Only certificates of this course id')
+        parser.add_argument('--issued-after', help='Only certificates issued on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--issued-before', help='Only certificates issued on or before this date (YYYY-MM-DD)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        if not REPORTLAB_AVAILABLE:
+            raise CommandError('ReportLab is not installed.')
+
+        certificates = Certificate.objects.all()
+        if options['course']:
+            certificates = certificates.filter(enrollment__course_id=options['course'])
+        if options['issued_after']:
+            certificates = certificates.filter(issued_at__date__gte=options['issued_after'])
+        if options['issued_before']:
+            certificates = certificates.filter(issued_at__date__lte=options['issued_before'])
+        total = certificates.count()
+        self.stdout.write(f'Rendering {total} certificates with {options["workers"]} workers')
+
+        started = time.monotonic()
+        step = max(total // 20, 1)
+
+        def progress(done, total):
+            if done % step == 0 or done == total:
+                elapsed = time.monotonic() - started
+                self.stdout.write(f'  {done}/{total} ({done / elapsed:.1f} certificates/s)')
+
+        with open(options['output'], 'wb') as out:
+            rows = certificate_data_rows(certificates)
+            for chunk in iter_certificate_archive(rows, workers=options['workers'], progress=progress, total=total):
+                out.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {options["output"]} in {time.monotonic() - started:.2f}s'
+        ))
@@ -0,0 +1,30 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from enrollment.exports import EXPORT_FORMATS, EXPORT_KINDS, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Stream lesson progress or enrollments of a course as CSV or NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', type=int)
+        parser.add_argument('--kind', choices=sorted(EXPORT_KINDS), default='progress')
+        parser.add_argument('--output', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--file', help='Write to this path instead of stdout')
+
+    def handle(self, *args, **options):
+        chunks = stream_export(options['course_id'], options['kind'], options['output'])
+        if options['file']:
+            try:
+                out = open(options['file'], 'w', newline='', encoding='utf-8')
+            except OSError as exc:
+                raise CommandError(str(exc))
+        else:
+            out = sys.stdout
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout:
+                out.close()
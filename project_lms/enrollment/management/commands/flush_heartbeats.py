@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from enrollment.heartbeats import flush_heartbeats
+
+
+class Command(BaseCommand):
+    help = 'Write buffered lesson heartbeat positions into LessonProgress (once, or every --interval seconds)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running and flush every N seconds (default: flush once and exit)'
+        )
+
+    def handle(self, *args, **options):
+        if isinstance(settings.HEARTBEAT_BUFFER, dict):
+            self.stdout.write(
+                'HEARTBEAT_BUFFER is in-process (REDIS_URL unset); web processes flush their own buffer.'
+            )
+
+        interval = options['interval']
+        while True:
+            written = flush_heartbeats()
+            self.stdout.write(f'Flushed {written} heartbeat positions')
+            if not interval:
+                break
+            time.sleep(interval)
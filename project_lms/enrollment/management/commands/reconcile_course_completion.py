@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from courses.models import Course
+from enrollment.progress import reconcile_course_completion
+
+
+class Command(BaseCommand):
+    help = 'Recompute enrollment completion from LessonProgress and issue missing certificates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', type=int, help='Course ids to reconcile')
+        parser.add_argument('--all', action='store_true', help='Reconcile every course')
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options['all']:
+            course_ids = list(Course.objects.order_by('pk').values_list('pk', flat=True))
+        else:
+            course_ids = options['course_ids']
+        if not course_ids:
+            raise CommandError('Pass one or more course ids, or --all.')
+
+        for course_id in course_ids:
+            stats = reconcile_course_completion(course_id, chunk_size=options['chunk_size'])
+            self.stdout.write(
+                f"Course {course_id}: {stats['enrollments']} enrollments reconciled "
+                f"({stats['completed']} completed, {stats['certificates_issued']} certificates issued) "
+                f"in {stats['seconds']}s"
+            )
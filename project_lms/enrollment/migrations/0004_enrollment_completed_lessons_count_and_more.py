@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:13
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_progress_counters(apps, schema_editor):
+    Enrollment = apps.get_model('enrollment', 'Enrollment')
+    LessonProgress = apps.get_model('enrollment', 'LessonProgress')
+    completed = (
+        LessonProgress.objects.filter(enrollment=OuterRef('pk'), is_completed=True)
+        .order_by().values('enrollment').annotate(n=Count('pk')).values('n')
+    )
+    Enrollment.objects.update(
+        completed_lessons_count=Coalesce(Subquery(completed, output_field=IntegerField()), 0),
+    )
+    Course = apps.get_model('courses', 'Course')
+    totals = Course.objects.filter(pk=OuterRef('course_id')).values('lesson_count')
+    Enrollment.objects.update(total_lessons_snapshot=Subquery(totals, output_field=IntegerField()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_lesson_count'),
+        ('enrollment', '0003_certificate_completion_statement_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_lessons_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='total_lessons_snapshot',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_progress_counters, migrations.RunPython.noop),
+    ]
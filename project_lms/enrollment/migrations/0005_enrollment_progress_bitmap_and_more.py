@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollment', '0004_enrollment_completed_lessons_count_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='progress_bitmap',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='progress_timestamps',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
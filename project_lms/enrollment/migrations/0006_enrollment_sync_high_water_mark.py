@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollment', '0005_enrollment_progress_bitmap_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='sync_high_water_mark',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollment', '0006_enrollment_sync_high_water_mark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lessonprogress',
+            name='last_position',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
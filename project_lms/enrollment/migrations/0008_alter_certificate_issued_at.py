@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollment', '0007_lessonprogress_last_position'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='certificate',
+            name='issued_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
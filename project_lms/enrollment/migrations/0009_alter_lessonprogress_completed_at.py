@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollment', '0008_alter_certificate_issued_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lessonprogress',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollment', '0009_alter_lessonprogress_completed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='short_code',
+            field=models.CharField(blank=True, editable=False, max_length=16, null=True, unique=True),
+        ),
+    ]
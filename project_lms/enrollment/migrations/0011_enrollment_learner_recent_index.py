@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_search_index'),
+        ('enrollment', '0010_certificate_short_code'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['learner', '-enrolled_at', '-id'], name='enrollment_learner_recent'),
+        ),
+    ]
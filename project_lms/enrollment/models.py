@@ -1,6 +1,7 @@
 import hashlib
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from courses.models import Course, Lesson
 
 class Enrollment(models.Model):
@@ -21,10 +22,26 @@ class Enrollment(models.Model):
     enrolled_at = models.DateTimeField(auto_now_add=True)
     completion_date = models.DateTimeField(null=True, blank=True)
     is_completed = models.BooleanField(default=False)
+    # Denormalized progress counters so completion checks never need COUNT queries.
+    # Both are maintained atomically with F() expressions (see enrollment/progress.py
+    # and LessonViewSet).
+    completed_lessons_count = models.PositiveIntegerField(default=0, editable=False)
+    total_lessons_snapshot = models.PositiveIntegerField(default=0, editable=False)
+    # Compact progress (ENROLLMENT_COMPACT_PROGRESS): bit N is set when the lesson
+    # with progress_slot N is complete, and progress_timestamps[N] holds its
+    # completion time as a unix timestamp. LessonProgress rows remain the audit trail.
+    progress_bitmap = models.BinaryField(default=b'', blank=True, editable=False)
+    progress_timestamps = models.JSONField(default=list, blank=True, editable=False)
+    # Highest client event id applied by the offline progress sync endpoint
+    sync_high_water_mark = models.PositiveBigIntegerField(default=0, editable=False)
 
     class Meta:
         unique_together = ('learner', 'course')
         ordering = ['-enrolled_at']
+        indexes = [
+            # Keyset pagination of a learner's enrollments (EnrollmentCursorPagination)
+            models.Index(fields=['learner', '-enrolled_at', '-id'], name='enrollment_learner_recent'),
+        ]
 
     def __str__(self):
         return f"{self.learner.username} enrolled in {self.course.title}"
@@ -43,8 +60,16 @@ class LessonProgress(models.Model):
         on_delete=models.CASCADE,
         related_name='progress'
     )
-    completed_at = models.DateTimeField(null=True, blank=True)
+    # Client-reported for offline syncs, so it can lie arbitrarily far in the past
+    completed_at = models.DateTimeField(null=True, blank=True, db_index=True)
     is_completed = models.BooleanField(default=False)
+    # Server time the completion state was last written; the incremental funnel
+    # rollups (creator.funnels) read rows by this. Set explicitly by the
+    # set-based completion writes, which bypass auto_now.
+    recorded_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Latest in-lesson position (scroll offset, video seconds, ...) reported by
+    # heartbeats. Written in bulk by enrollment.heartbeats.flush_heartbeats().
+    last_position = models.FloatField(null=True, blank=True)
 
     class Meta:
         unique_together = ('enrollment', 'lesson')
@@ -52,6 +77,35 @@ class LessonProgress(models.Model):
     def __str__(self):
         return f"{self.enrollment.learner.username} progress on {self.lesson.title}"
 
+CERTIFICATE_VERIFY_CACHE_PREFIX = "certificate_verify_"
+# 16 hex characters (64 bits) keep collisions negligible at any realistic volume
+SHORT_CODE_LENGTH = 16
+
+
+CERTIFICATE_HTML_CACHE_PREFIX = "certificate_html_"
+
+
+def certificate_verify_cache_key(serial_hash):
+    return f"{CERTIFICATE_VERIFY_CACHE_PREFIX}{serial_hash}"
+
+
+def certificate_html_cache_key(code):
+    """Cached (etag, html) of a certificate looked up by serial hash or short code."""
+    return f"{CERTIFICATE_HTML_CACHE_PREFIX}{settings.CERTIFICATE_TEMPLATE_VERSION}_{code}"
+
+
+def compute_serial_hash(enrollment_id, learner_id, course_id, issued_at):
+    """SHA256 of the data a certificate attests to; a plain function so batch jobs can hash raw rows."""
+    # Data to be hashed: Enrollment ID, User ID, Course ID, Issued Timestamp
+    data_string = f"{enrollment_id}:{learner_id}:{course_id}:{issued_at}"
+    return hashlib.sha256(data_string.encode('utf-8')).hexdigest()
+
+
+def short_code_for(serial_hash):
+    """Short public code of a certificate: a prefix of its serial hash."""
+    return serial_hash[:SHORT_CODE_LENGTH]
+
+
 class Certificate(models.Model):
     """
     Stores the certificate details and the unique serial hash.
@@ -63,7 +117,11 @@ class Certificate(models.Model):
     )
     # The unique, verifiable hash
     serial_hash = models.CharField(max_length=64, unique=True, editable=False)
-    issued_at = models.DateTimeField(auto_now_add=True)
+    # Short, human-friendly id (prefix of serial_hash) printed on certificates and
+    # accepted by the render endpoints
+    short_code = models.CharField(max_length=SHORT_CODE_LENGTH, unique=True, null=True, blank=True, editable=False)
+    # Set before insert (not auto_now_add) so bulk issuance can hash it up front
+    issued_at = models.DateTimeField(default=timezone.now, editable=False)
     # Certificate metadata / display fields
     title = models.CharField(max_length=255, default='Certificate of Completion')
     recipient_name = models.CharField(max_length=255, blank=True)
@@ -78,51 +136,83 @@ class Certificate(models.Model):
 
     def generate_serial_hash(self):
         """Generates a SHA256 hash based on core data for verification."""
-        # Data to be hashed: Enrollment ID, User ID, Course ID, Issued Timestamp
-        data_string = f"{self.enrollment.id}:{self.enrollment.learner.id}:{self.enrollment.course.id}:{self.issued_at}"
-        return hashlib.sha256(data_string.encode('utf-8')).hexdigest()
+        # Uses the enrollment's foreign key ids so no learner/course rows are loaded
+        return compute_serial_hash(
+            self.enrollment_id, self.enrollment.learner_id, self.enrollment.course_id, self.issued_at
+        )
+
+    def generate_short_code(self):
+        return short_code_for(self.serial_hash)
+
+    @staticmethod
+    def code_lookup(code):
+        """Exact-match filter for a full serial hash or a short code."""
+        if len(code) > SHORT_CODE_LENGTH:
+            return {'serial_hash': code}
+        return {'short_code': code}
+
+    def populate_display_fields(self):
+        """Fill recipient, course and issuer details from the enrollment when not provided."""
+        try:
+            learner = self.enrollment.learner
+            course = self.enrollment.course
+        except Exception:
+            learner = None
+            course = None
+
+        if not self.recipient_name and learner:
+            full = learner.get_full_name().strip()
+            self.recipient_name = full if full else learner.username
+
+        if not self.course_title and course:
+            self.course_title = course.title
+
+        if not self.course_code and course:
+            self.course_code = getattr(course, 'code', None)
+
+        issuer_name = getattr(settings, 'CERT_ISSUER_NAME', None)
+        if not issuer_name and course and hasattr(course, 'creator'):
+            issuer_name = course.creator.get_full_name() or course.creator.username
+        if not self.issuer_name and issuer_name:
+            self.issuer_name = issuer_name
+
+        if not self.completion_statement and self.recipient_name and self.course_title:
+            self.completion_statement = f"This is to certify that {self.recipient_name} has successfully completed the course {self.course_title}."
+
+    @classmethod
+    def issue_bulk(cls, enrollments):
+        """
+        Issue certificates for `enrollments` with a single INSERT. Enrollments
+        should come with learner and course__creator selected. Enrollments that
+        gained a certificate concurrently are skipped; only the certificates
+        actually inserted are returned.
+        """
+        issued_at = timezone.now()
+        certificates = []
+        for enrollment in enrollments:
+            certificate = cls(enrollment=enrollment, issued_at=issued_at)
+            certificate.populate_display_fields()
+            certificate.serial_hash = certificate.generate_serial_hash()
+            certificate.short_code = certificate.generate_short_code()
+            certificates.append(certificate)
+        cls.objects.bulk_create(certificates, ignore_conflicts=True)
+        # bulk_create returns skipped rows too. Serial hashes cover issued_at, so
+        # a concurrently issued certificate never carries one of ours.
+        inserted = set(
+            cls.objects.filter(serial_hash__in=[c.serial_hash for c in certificates]).values_list('serial_hash', flat=True)
+        )
+        return [certificate for certificate in certificates if certificate.serial_hash in inserted]
 
     def save(self, *args, **kwargs):
-        # Populate display fields from related enrollment/course/user when first created
+        # Populate display fields and the hash before the first INSERT; issued_at
+        # defaults to now() on instantiation so everything hashed is already known
         if not self.pk:
-            # Fill recipient and course info if not provided
-            try:
-                learner = self.enrollment.learner
-                course = self.enrollment.course
-            except Exception:
-                learner = None
-                course = None
-
-            if not self.recipient_name and learner:
-                full = learner.get_full_name().strip()
-                self.recipient_name = full if full else learner.username
-
-            if not self.course_title and course:
-                self.course_title = course.title
-
-            if not self.course_code and course:
-                self.course_code = getattr(course, 'code', None)
-
-            from django.conf import settings
-            issuer_name = getattr(settings, 'CERT_ISSUER_NAME', None)
-            if not issuer_name and course and hasattr(course, 'creator'):
-                issuer_name = course.creator.get_full_name() or course.creator.username
-            if not self.issuer_name and issuer_name:
-                self.issuer_name = issuer_name
-
-            if not self.completion_statement and self.recipient_name and self.course_title:
-                self.completion_statement = f"This is to certify that {self.recipient_name} has successfully completed the course {self.course_title}."
-
-            # First save to get issued_at and PK
-            super().save(*args, **kwargs)
-
-            # Refresh from DB to ensure issued_at and other fields are populated
-            self.refresh_from_db()
-            # Generate serial_hash and persist only that field to avoid duplicate INSERT
-            self.serial_hash = self.generate_serial_hash()
-            super().save(update_fields=['serial_hash'])
-        else:
-            super().save(*args, **kwargs)
+            self.populate_display_fields()
+            if not self.serial_hash:
+                self.serial_hash = self.generate_serial_hash()
+            if not self.short_code:
+                self.short_code = self.generate_short_code()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Cert for {self.enrollment.course.title} ({self.serial_hash[:8]}...)"
\ No newline at end of file
@@ -0,0 +1,256 @@
+"""
+Certificate PDF rendering and its content-addressed cache.
+
+A certificate never changes after issuance except through its display
+fields, so rendered PDFs are cached under a fingerprint of those fields and
+CERTIFICATE_TEMPLATE_VERSION. The fingerprint doubles as the ETag, and a
+changed field or template simply produces a new cache entry.
+
+The renderer only reads plain attributes, so it accepts a Certificate or the
+picklable CertificateData snapshot used to render archives in worker processes.
+"""
+import collections
+import contextlib
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:
+    # ReportLab used for server-side PDF generation
+    from reportlab.lib.pagesizes import landscape, A4
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.colors import HexColor
+    from reportlab import rl_config
+    REPORTLAB_AVAILABLE = True
+except Exception:
+    REPORTLAB_AVAILABLE = False
+
+PDF_CACHE_PREFIX = "certificate_pdf_"
+
+# Everything drawn on the certificate; changing any of these changes the PDF
+CERTIFICATE_DISPLAY_FIELDS = (
+    'serial_hash', 'title', 'recipient_name', 'course_title', 'course_code', 'issuer_name',
+    'issued_at', 'duration_hours', 'grade', 'signature_text',
+)
+
+
+# Picklable snapshot of a certificate's display fields for worker processes
+CertificateData = namedtuple('CertificateData', CERTIFICATE_DISPLAY_FIELDS)
+
+
+def certificate_data(certificate):
+    return CertificateData(*(getattr(certificate, field) for field in CERTIFICATE_DISPLAY_FIELDS))
+
+
+def certificate_fingerprint(certificate):
+    """Stable digest of the template version and the certificate's display fields."""
+    parts = [settings.CERTIFICATE_TEMPLATE_VERSION]
+    parts += [str(getattr(certificate, field) or '') for field in CERTIFICATE_DISPLAY_FIELDS]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+INK = '#111827'
+ACCENT = '#0ea5e9'
+MARGIN_X = 80
+
+_a85_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _without_ascii85():
+    """
+    Serialize with plain zlib streams: ReportLab's ASCII85 pass is pure Python
+    without its C accelerator and makes the content stream ~25% larger.
+    rl_config is global, so the switch is held only around our own saves.
+    """
+    with _a85_lock:
+        previous = rl_config.useA85
+        rl_config.useA85 = 0
+        try:
+            yield
+        finally:
+            rl_config.useA85 = previous
+
+
+def render_certificate_pdf_bytes(certificate):
+    """Draw `certificate` (a Certificate or CertificateData) and return the PDF bytes."""
+    buffer = io.BytesIO()
+    # Starting in a font the certificate uses keeps an unused Helvetica out of the PDF
+    c = canvas.Canvas(buffer, pagesize=landscape(A4), initialFontName='Times-Roman')
+    width, height = landscape(A4)
+
+    # Simple centered layout
+    c.setFillColor(HexColor(ACCENT))
+    c.setFont('Times-Bold', 36)
+    c.drawCentredString(width/2, height - 100, certificate.title or 'Certificate of Completion')
+
+    c.setFillColor(HexColor(INK))
+    c.setFont('Times-Roman', 14)
+    c.drawCentredString(width/2, height - 140, 'This is to certify that')
+
+    # Recipient name
+    c.setFont('Times-Bold', 32)
+    c.drawCentredString(width/2, height - 190, certificate.recipient_name or '')
+
+    # Course title
+    c.setFont('Times-Roman', 16)
+    course_line = certificate.course_title or ''
+    if certificate.course_code:
+        course_line = f"{course_line} ({certificate.course_code})"
+    c.drawCentredString(width/2, height - 230, f"has successfully completed the course: {course_line}")
+
+    # Meta block
+    c.setFont('Times-Roman', 12)
+    left_x = MARGIN_X
+    right_x = width - MARGIN_X
+    c.drawString(left_x, height - 300, f"Date of completion: {certificate.issued_at.strftime('%B %d, %Y') if certificate.issued_at else ''}")
+    if certificate.duration_hours:
+        c.drawString(left_x, height - 320, f"Duration: {certificate.duration_hours}")
+    if certificate.grade:
+        c.drawString(left_x, height - 340, f"Achievement: {certificate.grade}")
+
+    c.drawRightString(right_x, height - 300, f"Issued by: {certificate.issuer_name}")
+    c.drawRightString(right_x, height - 320, f"Certificate ID: {certificate.serial_hash}")
+
+    # Signatures
+    sig_y = height - 420
+    c.line(left_x, sig_y, left_x + 220, sig_y)
+    c.drawString(left_x, sig_y - 14, certificate.signature_text or '(Signature) — Instructor')
+
+    c.line(right_x - 220, sig_y, right_x, sig_y)
+    c.drawString(right_x - 220, sig_y - 14, 'Director — Krishna')
+
+    c.showPage()
+    with _without_ascii85():
+        c.save()
+    return buffer.getvalue()
+
+
+def cached_pdf_directory(certificate):
+    """
+    Per-certificate directory holding its renders, sharded by serial prefix so
+    no single directory grows with the number of certificates.
+    """
+    serial = certificate.serial_hash
+    return os.path.join(settings.CERTIFICATE_PDF_CACHE_DIR, serial[:2], serial)
+
+
+def cached_pdf_path(certificate, fingerprint):
+    return os.path.join(cached_pdf_directory(certificate), f"{fingerprint[:16]}.pdf")
+
+
+def get_cached_pdf(certificate, fingerprint):
+    """
+    Return the rendered PDF for `certificate`, rendering it on a miss.
+    With a cache directory configured this is a file path, otherwise bytes
+    from the cache backend.
+    """
+    if not settings.CERTIFICATE_PDF_CACHE_DIR:
+        key = f"{PDF_CACHE_PREFIX}{fingerprint}"
+        pdf = cache.get(key)
+        if pdf is None:
+            pdf = render_certificate_pdf_bytes(certificate)
+            cache.set(key, pdf, timeout=None)
+        return pdf
+
+    path = cached_pdf_path(certificate, fingerprint)
+    if os.path.exists(path):
+        return path
+
+    directory = cached_pdf_directory(certificate)
+    os.makedirs(directory, exist_ok=True)
+    pdf = render_certificate_pdf_bytes(certificate)
+    # Write to a temp file and rename so concurrent readers never see a partial PDF
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as tmp:
+        tmp.write(pdf)
+    os.replace(tmp_path, path)
+
+    # Drop renders of this certificate made from older display fields/templates;
+    # only its own directory is listed
+    for name in os.listdir(directory):
+        if name.endswith('.pdf') and os.path.join(directory, name) != path:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+    return path
+
+
+def certificate_data_rows(queryset):
+    """Yield CertificateData for each certificate in `queryset`, read in chunks without instantiating models."""
+    for row in queryset.order_by('pk').values_list(*CERTIFICATE_DISPLAY_FIELDS).iterator(chunk_size=2000):
+        yield CertificateData(*row)
+
+
+def render_archive_entry(data):
+    """Worker entry point: (file name inside the archive, PDF bytes) for a CertificateData."""
+    return f"{data.serial_hash}.pdf", render_certificate_pdf_bytes(data)
+
+
+class _ZipStream:
+    """Write-only file object that collects what ZipFile writes so it can be yielded."""
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _bounded_map(executor, fn, items, window):
+    """
+    Like executor.map(), but only keeps `window` tasks submitted ahead of the
+    consumer, so finished results never pile up faster than they are read.
+    """
+    pending = collections.deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_certificate_archive(certificates, workers=1, progress=None, total=None):
+    """
+    Render `certificates` (an iterable of CertificateData) across `workers`
+    processes and yield a ZIP archive of the PDFs chunk by chunk. At most two
+    renders per worker are in flight, so memory stays bounded however slowly
+    the archive is consumed. `progress(done, total)` is called after each
+    certificate.
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            entries = _bounded_map(executor, render_archive_entry, certificates, window=2 * workers)
+        else:
+            executor = None
+            entries = map(render_archive_entry, certificates)
+        try:
+            for done, (name, pdf) in enumerate(entries, start=1):
+                archive.writestr(name, pdf)
+                if progress:
+                    progress(done, total)
+                yield stream.drain()
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+    yield stream.drain()
@@ -0,0 +1,312 @@
+"""
+Lesson progress bookkeeping shared by the enrollment endpoints.
+
+Enrollment carries denormalized counters (`completed_lessons_count` and
+`total_lessons_snapshot`) which are kept in step here with F() expressions,
+so deciding whether a course is finished never needs a COUNT query.
+
+With ENROLLMENT_COMPACT_PROGRESS enabled, completed lessons are also packed
+into `Enrollment.progress_bitmap` (bit N <=> Lesson.progress_slot N), which is
+what reads and the completion check use instead of the LessonProgress table.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    BooleanField, Case, Count, DateTimeField, F, IntegerField, OuterRef, Subquery, Value, When
+)
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThanOrEqual
+from django.utils import timezone
+
+from courses.models import Course, Lesson
+from .models import Enrollment, LessonProgress, Certificate
+
+
+def compact_progress_enabled():
+    return getattr(settings, 'ENROLLMENT_COMPACT_PROGRESS', False)
+
+
+def has_bit(bitmap, index):
+    byte, bit = divmod(index, 8)
+    return byte < len(bitmap) and bool(bitmap[byte] >> bit & 1)
+
+
+def set_bits(bitmap, timestamps, completions):
+    """
+    Return (bitmap, timestamps) with the bits of `completions` (slot -> datetime)
+    set. Bits that are already set keep their original timestamp.
+    """
+    data = bytearray(bitmap or b'')
+    timestamps = list(timestamps or [])
+    for slot, completed_at in completions.items():
+        byte, bit = divmod(slot, 8)
+        if len(data) <= byte:
+            data.extend(bytes(byte + 1 - len(data)))
+        if len(timestamps) <= slot:
+            timestamps.extend([None] * (slot + 1 - len(timestamps)))
+        if not data[byte] >> bit & 1:
+            data[byte] |= 1 << bit
+            timestamps[slot] = int(completed_at.timestamp()) if completed_at else None
+    return bytes(data), timestamps
+
+
+def completed_lesson_ids(enrollment, lessons):
+    """Ids of the `lessons` whose bit is set in the enrollment's progress bitmap."""
+    bitmap = bytes(enrollment.progress_bitmap or b'')
+    return [
+        lesson.id for lesson in lessons
+        if lesson.progress_slot is not None and has_bit(bitmap, lesson.progress_slot)
+    ]
+
+
+def _lock_enrollment(enrollment):
+    """Serialize progress writes for one enrollment for the rest of the transaction."""
+    Enrollment.objects.select_for_update().filter(pk=enrollment.pk).values_list('pk').first()
+
+
+def _write_bitmap(enrollment, completions):
+    """Fold `completions` (slot -> datetime) into the stored bitmap. Caller holds the lock."""
+    current = Enrollment.objects.values_list('progress_bitmap', 'progress_timestamps').get(pk=enrollment.pk)
+    enrollment.progress_bitmap, enrollment.progress_timestamps = set_bits(bytes(current[0] or b''), current[1], completions)
+    Enrollment.objects.filter(pk=enrollment.pk).update(
+        progress_bitmap=enrollment.progress_bitmap,
+        progress_timestamps=enrollment.progress_timestamps
+    )
+
+
+def record_lesson_completion(enrollment, lesson):
+    """
+    Mark `lesson` complete for `enrollment` and bump the enrollment's counter.
+    Returns (progress, newly_completed).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        _lock_enrollment(enrollment)
+        progress, created = LessonProgress.objects.get_or_create(
+            enrollment=enrollment,
+            lesson=lesson,
+            defaults={'is_completed': True, 'completed_at': now}
+        )
+        if not created:
+            if progress.is_completed:
+                return progress, False
+            # Conditional update so two concurrent requests can't both count the lesson
+            updated = LessonProgress.objects.filter(pk=progress.pk, is_completed=False).update(
+                is_completed=True, completed_at=now, recorded_at=now
+            )
+            if not updated:
+                progress.refresh_from_db()
+                return progress, False
+            progress.is_completed = True
+            progress.completed_at = now
+
+        Enrollment.objects.filter(pk=enrollment.pk).update(
+            completed_lessons_count=F('completed_lessons_count') + 1
+        )
+        if compact_progress_enabled() and lesson.progress_slot is not None:
+            _write_bitmap(enrollment, {lesson.progress_slot: now})
+    return progress, True
+
+
+def record_lesson_completions(enrollment, completions):
+    """
+    Set-based variant of record_lesson_completion.
+
+    `completions` maps lesson id -> completed_at for lessons already known to
+    belong to the enrollment's course. Lessons that are not yet complete are
+    written with a single upsert and the counter is bumped once.
+    Returns the set of lesson ids that were newly completed.
+    """
+    if not completions:
+        return set()
+    with transaction.atomic():
+        _lock_enrollment(enrollment)
+        already_done = set(
+            LessonProgress.objects.filter(
+                enrollment=enrollment, lesson_id__in=list(completions), is_completed=True
+            ).values_list('lesson_id', flat=True)
+        )
+        pending = [lesson_id for lesson_id in completions if lesson_id not in already_done]
+        if pending:
+            LessonProgress.objects.bulk_create(
+                [
+                    LessonProgress(
+                        enrollment=enrollment, lesson_id=lesson_id,
+                        is_completed=True, completed_at=completions[lesson_id]
+                    )
+                    for lesson_id in pending
+                ],
+                update_conflicts=True,
+                unique_fields=['enrollment', 'lesson'],
+                # recorded_at is filled in by auto_now on insert
+                update_fields=['is_completed', 'completed_at', 'recorded_at'],
+            )
+            Enrollment.objects.filter(pk=enrollment.pk).update(
+                completed_lessons_count=F('completed_lessons_count') + len(pending)
+            )
+            if compact_progress_enabled():
+                slots = Lesson.objects.filter(pk__in=pending, progress_slot__isnull=False).values_list('id', 'progress_slot')
+                _write_bitmap(enrollment, {slot: completions[lesson_id] for lesson_id, slot in slots})
+    return set(pending)
+
+
+def apply_progress_events(enrollment, events):
+    """
+    Replay an ordered batch of client progress events in one transaction.
+
+    Events whose `event_id` is not above the enrollment's stored high-water
+    mark were applied by an earlier sync and are skipped, which makes replays
+    idempotent. Returns a dict of applied / duplicate / rejected event ids.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        high_water_mark = (
+            Enrollment.objects.select_for_update()
+            .values_list('sync_high_water_mark', flat=True).get(pk=enrollment.pk)
+        )
+        fresh = [event for event in events if event['event_id'] > high_water_mark]
+        valid_ids = set(
+            Lesson.objects.filter(
+                course_id=enrollment.course_id, pk__in={event['lesson_id'] for event in fresh}
+            ).values_list('id', flat=True)
+        )
+
+        completions = {}
+        applied, rejected = [], []
+        for event in fresh:
+            if event['lesson_id'] not in valid_ids:
+                rejected.append(event['event_id'])
+                continue
+            applied.append(event['event_id'])
+            # The first completion of a lesson wins; client clocks can't post-date it
+            completed_at = min(event.get('occurred_at') or now, now)
+            completions.setdefault(event['lesson_id'], completed_at)
+
+        record_lesson_completions(enrollment, completions)
+        if fresh:
+            enrollment.sync_high_water_mark = fresh[-1]['event_id']
+            Enrollment.objects.filter(pk=enrollment.pk).update(sync_high_water_mark=enrollment.sync_high_water_mark)
+
+    return {
+        'applied': applied,
+        'duplicates': [event['event_id'] for event in events if event['event_id'] <= high_water_mark],
+        'rejected': rejected,
+    }
+
+
+def complete_enrollment_if_finished(enrollment):
+    """
+    Flip `enrollment` to completed and auto-issue its certificate once every
+    lesson is done. Returns True only when this call completed the course.
+    """
+    if compact_progress_enabled():
+        enrollment.refresh_from_db(fields=['progress_bitmap', 'is_completed'])
+        if enrollment.is_completed:
+            return False
+        slots = list(Lesson.objects.filter(course_id=enrollment.course_id).values_list('progress_slot', flat=True))
+        bitmap = bytes(enrollment.progress_bitmap or b'')
+        if not slots or not all(slot is not None and has_bit(bitmap, slot) for slot in slots):
+            return False
+    else:
+        enrollment.refresh_from_db(fields=['completed_lessons_count', 'total_lessons_snapshot', 'is_completed'])
+        total = enrollment.total_lessons_snapshot
+        if enrollment.is_completed or total == 0 or enrollment.completed_lessons_count < total:
+            return False
+
+    now = timezone.now()
+    with transaction.atomic():
+        updated = Enrollment.objects.filter(pk=enrollment.pk, is_completed=False).update(
+            is_completed=True, completion_date=now
+        )
+        enrollment.refresh_from_db(fields=['is_completed', 'completion_date'])
+        if not updated:
+            # Another request finished the course first
+            return False
+        if not hasattr(enrollment, 'certificate'):
+            Certificate.objects.create(enrollment=enrollment)
+    return True
+
+
+def reconcile_course_completion(course_id, chunk_size=5000):
+    """
+    Recompute lesson counters, `is_completed` and `completion_date` for every
+    enrollment of a course from LessonProgress, one set-based UPDATE per chunk
+    of enrollments, then issue any missing certificates in bulk.
+    Returns a dict of statistics including the elapsed time.
+    """
+    started = time.monotonic()
+    now = timezone.now()
+
+    lesson_counts = (
+        Lesson.objects.filter(course=OuterRef('pk'))
+        .order_by().values('course').annotate(n=Count('pk')).values('n')
+    )
+    Course.objects.filter(pk=course_id).update(
+        lesson_count=Coalesce(Subquery(lesson_counts, output_field=IntegerField()), 0)
+    )
+    total = Course.objects.values_list('lesson_count', flat=True).get(pk=course_id)
+
+    completed = Coalesce(
+        Subquery(
+            LessonProgress.objects.filter(enrollment=OuterRef('pk'), is_completed=True)
+            .order_by().values('enrollment').annotate(n=Count('pk')).values('n'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+    finished = GreaterThanOrEqual(completed, total) if total else Value(False)
+
+    enrollments = Enrollment.objects.filter(course_id=course_id).order_by('pk')
+    last_pk = 0
+    updated = 0
+    while True:
+        # Upper bound of the next chunk; the UPDATE then covers a contiguous pk range
+        bound = enrollments.filter(pk__gt=last_pk).values_list('pk', flat=True)[chunk_size - 1:chunk_size].first()
+        chunk = enrollments.filter(pk__gt=last_pk)
+        if bound is not None:
+            chunk = chunk.filter(pk__lte=bound)
+        updated += chunk.update(
+            completed_lessons_count=completed,
+            total_lessons_snapshot=total,
+            is_completed=Case(When(finished, then=Value(True)), default=Value(False), output_field=BooleanField()),
+            completion_date=Case(
+                When(finished, then=Coalesce(F('completion_date'), Value(now))),
+                default=Value(None),
+                output_field=DateTimeField()
+            ),
+        )
+        if bound is None:
+            break
+        last_pk = bound
+
+    issued = issue_course_certificates(course_id, chunk_size=chunk_size)
+
+    return {
+        'course_id': course_id,
+        'lessons': total,
+        'enrollments': updated,
+        'completed': enrollments.filter(is_completed=True).count(),
+        'certificates_issued': issued,
+        'seconds': round(time.monotonic() - started, 3),
+    }
+
+
+def issue_course_certificates(course_id, chunk_size=1000):
+    """
+    Issue certificates for every completed enrollment of a course that has
+    none yet, one INSERT per chunk. Returns the number issued.
+    """
+    uncertified = Enrollment.objects.filter(
+        course_id=course_id, is_completed=True, certificate__isnull=True
+    ).select_related('learner', 'course__creator').order_by('pk')
+    issued = 0
+    last_pk = 0
+    while True:
+        batch = list(uncertified.filter(pk__gt=last_pk)[:chunk_size])
+        if not batch:
+            break
+        issued += len(Certificate.issue_bulk(batch))
+        last_pk = batch[-1].pk
+    return issued
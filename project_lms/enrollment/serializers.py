@@ -1,15 +1,36 @@
 from rest_framework import serializers
 from .models import Enrollment, LessonProgress, Certificate
+from .progress import compact_progress_enabled, completed_lesson_ids
+from .tokens import certificate_token
 from courses.serializers import CourseSerializer
+from core.serializers import SparseFieldsMixin
 from courses.models import Course
 
-class EnrollmentSerializer(serializers.ModelSerializer):
+class CertificateSerializer(serializers.ModelSerializer):
+    learner_username = serializers.CharField(source='enrollment.learner.username', read_only=True)
+    course_title = serializers.CharField(source='enrollment.course.title', read_only=True)
+    # Signed token third parties can verify without a database lookup
+    verification_token = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Certificate
+        fields = (
+            'id', 'learner_username', 'recipient_name', 'title', 'course_title', 'course_code',
+            'issuer_name', 'completion_statement', 'issued_at', 'serial_hash', 'short_code', 'duration_hours', 'grade',
+            'issuer_logo_url', 'signature_text', 'verification_token'
+        )
+        read_only_fields = fields
+
+    def get_verification_token(self, obj):
+        return certificate_token(obj)
+
+class EnrollmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     course_title = serializers.CharField(source='course.title', read_only=True)
     learner_username = serializers.CharField(source='learner.username', read_only=True)
     # Provide completed lesson IDs so frontend can compute progress easily
     completed_lessons = serializers.SerializerMethodField(read_only=True)
-    # Include certificate data if present
-    certificate = serializers.SerializerMethodField(read_only=True)
+    # Include certificate data if present (null otherwise)
+    certificate = CertificateSerializer(read_only=True)
 
     class Meta:
         model = Enrollment
@@ -28,33 +49,57 @@ class EnrollmentSerializer(serializers.ModelSerializer):
 
     def get_completed_lessons(self, obj):
         # Return a list of lesson IDs marked as completed for this enrollment
+        if compact_progress_enabled():
+            return completed_lesson_ids(obj, obj.course.lessons.all())
+        # Use the rows prefetched by the list/detail views when available
+        completed = getattr(obj, 'completed_progress', None)
+        if completed is not None:
+            return [progress.lesson_id for progress in completed]
         return list(obj.lesson_progress.filter(is_completed=True).values_list('lesson_id', flat=True))
 
-    def get_certificate(self, obj):
-        try:
-            cert = obj.certificate
-            from .serializers import CertificateSerializer
-            return CertificateSerializer(cert).data
-        except Certificate.DoesNotExist:
-            return None
-
 class LessonProgressSerializer(serializers.ModelSerializer):
     lesson_title = serializers.CharField(source='lesson.title', read_only=True)
 
     class Meta:
         model = LessonProgress
-        fields = ('id', 'enrollment', 'lesson', 'lesson_title', 'is_completed', 'completed_at')
-        read_only_fields = ('enrollment', 'lesson', 'completed_at')
+        fields = ('id', 'enrollment', 'lesson', 'lesson_title', 'is_completed', 'completed_at', 'last_position')
+        read_only_fields = ('enrollment', 'lesson', 'completed_at', 'last_position')
 
-class CertificateSerializer(serializers.ModelSerializer):
-    learner_username = serializers.CharField(source='enrollment.learner.username', read_only=True)
-    course_title = serializers.CharField(source='enrollment.course.title', read_only=True)
+class ProgressEventSerializer(serializers.Serializer):
+    """A lesson completion recorded by the client while offline."""
+    event_id = serializers.IntegerField(min_value=1)
+    lesson_id = serializers.IntegerField(min_value=1)
+    occurred_at = serializers.DateTimeField(required=False)
 
-    class Meta:
-        model = Certificate
-        fields = (
-            'id', 'learner_username', 'recipient_name', 'title', 'course_title', 'course_code',
-            'issuer_name', 'completion_statement', 'issued_at', 'serial_hash', 'duration_hours', 'grade',
-            'issuer_logo_url', 'signature_text'
-        )
-        read_only_fields = fields
\ No newline at end of file
+class ProgressSyncSerializer(serializers.Serializer):
+    MAX_EVENTS = 1000
+
+    events = ProgressEventSerializer(many=True, allow_empty=True)
+
+    def validate_events(self, value):
+        if len(value) > self.MAX_EVENTS:
+            raise serializers.ValidationError(f"At most {self.MAX_EVENTS} events can be synced at once.")
+        event_ids = [event['event_id'] for event in value]
+        if any(a >= b for a, b in zip(event_ids, event_ids[1:])):
+            raise serializers.ValidationError("Events must be ordered by strictly increasing event_id.")
+        return value
+
+class LessonHeartbeatSerializer(serializers.Serializer):
+    """Current position inside a lesson, reported every few seconds."""
+    position = serializers.FloatField(min_value=0)
+
+class LessonCompletionBatchSerializer(serializers.Serializer):
+    """Payload for completing several lessons of one enrollment at once."""
+    lesson_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500
+    )
+
+class CertificateBulkVerifySerializer(serializers.Serializer):
+    """Serial hashes to verify in one request."""
+    serial_hashes = serializers.ListField(
+        child=serializers.CharField(max_length=64),
+        allow_empty=False,
+        max_length=500
+    )
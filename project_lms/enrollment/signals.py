@@ -0,0 +1,14 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Certificate, certificate_html_cache_key, certificate_verify_cache_key
+
+
+@receiver([post_save, post_delete], sender=Certificate)
+def invalidate_certificate_verification(sender, instance, **kwargs):
+    """Drop cached verification results and HTML renders whenever a certificate changes or is revoked."""
+    keys = [certificate_html_cache_key(code) for code in (instance.serial_hash, instance.short_code) if code]
+    if instance.serial_hash:
+        keys.append(certificate_verify_cache_key(instance.serial_hash))
+    cache.delete_many(keys)
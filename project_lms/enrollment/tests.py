@@ -1,3 +1,50 @@
-from django.test import TestCase
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from courses.models import Course, Lesson
+from users.models import User
+from .models import Enrollment, LessonProgress, Certificate
+
+
+class EnrollmentListQueryCountTests(APITestCase):
+    """The enrollment list must not issue queries per row."""
+
+    def setUp(self):
+        self.creator = User.objects.create_user('creator', password='pass', role=settings.ROLE_CREATOR)
+        self.learner = User.objects.create_user('learner', password='pass', role=settings.ROLE_LEARNER)
+        self.client.force_authenticate(self.learner)
+
+    def enroll_in_courses(self, count):
+        for i in range(count):
+            course = Course.objects.create(
+                title=f'Course {i}', description='Demo', creator=self.creator, status=Course.STATUS_PUBLISHED
+            )
+            lessons = [Lesson.objects.create(course=course, title=f'Lesson {n}', content='Demo', order=n) for n in (1, 2)]
+            enrollment = Enrollment.objects.create(learner=self.learner, course=course)
+            LessonProgress.objects.create(
+                enrollment=enrollment, lesson=lessons[0], is_completed=True, completed_at=timezone.now()
+            )
+            # Every other enrollment has a certificate
+            if i % 2:
+                Certificate.objects.create(enrollment=enrollment)
+
+    def count_list_queries(self, page_size):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/enrollment/', {'page_size': page_size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), page_size)
+        return len(ctx), response.data['results']
+
+    def test_query_count_is_constant_as_page_grows(self):
+        self.enroll_in_courses(8)
+        small, _ = self.count_list_queries(2)
+        large, results = self.count_list_queries(8)
+        self.assertEqual(small, large)
+
+        with_cert = [row for row in results if row['certificate']]
+        self.assertEqual(len(with_cert), 4)
+        self.assertEqual(with_cert[0]['certificate']['learner_username'], 'learner')
+        self.assertTrue(all(len(row['completed_lessons']) == 1 for row in results))
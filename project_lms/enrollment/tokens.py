@@ -0,0 +1,44 @@
+"""
+Stateless, signed certificate verification tokens.
+
+A token is the certificate's serial hash, recipient, course title and issue
+date, signed with HMAC (django.core.signing) under CERTIFICATE_TOKEN_KEY. Anyone
+holding the token can have it verified without a database query; revocation is
+only visible through the database-backed CertificateVerifyView.
+"""
+from django.conf import settings
+from django.core import signing
+
+CERTIFICATE_TOKEN_SALT = 'enrollment.certificate'
+
+
+class InvalidCertificateToken(Exception):
+    pass
+
+
+def certificate_token(certificate):
+    """Compact signed token for `certificate` (a Certificate or CertificateData)."""
+    payload = {
+        'h': certificate.serial_hash,
+        'r': certificate.recipient_name,
+        'c': certificate.course_title,
+        'd': certificate.issued_at.date().isoformat() if certificate.issued_at else None,
+    }
+    return signing.dumps(payload, key=settings.CERTIFICATE_TOKEN_KEY, salt=CERTIFICATE_TOKEN_SALT, compress=True)
+
+
+def verify_certificate_token(token):
+    """
+    Check the signature of `token` and return the certificate details it
+    carries. Pure computation; raises InvalidCertificateToken when tampered.
+    """
+    try:
+        payload = signing.loads(token, key=settings.CERTIFICATE_TOKEN_KEY, salt=CERTIFICATE_TOKEN_SALT)
+    except signing.BadSignature:
+        raise InvalidCertificateToken('Invalid certificate token.')
+    return {
+        'serial_hash': payload['h'],
+        'recipient_name': payload['r'],
+        'course_title': payload['c'],
+        'issued_on': payload['d'],
+    }
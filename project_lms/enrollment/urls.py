@@ -1,8 +1,10 @@
 from django.urls import path
 from .views import (
     EnrollmentListCreateView, EnrollmentDetailView,
-    mark_lesson_complete, issue_certificate, CertificateVerifyView,
-    render_certificate, render_certificate_pdf, CourseProgressList
+    mark_lesson_complete, mark_lessons_complete, sync_progress, lesson_heartbeat, issue_certificate, CertificateVerifyView,
+    issue_course_certificates_view, verify_certificates_bulk, verify_certificate_token_view,
+    render_certificate, render_certificate_pdf, CourseProgressList, CourseProgressMatrix,
+    export_course_progress, certificate_archive
 )
 
 urlpatterns = [
@@ -13,18 +15,34 @@ urlpatterns = [
     # Progress
     path('<int:course_id>/lessons/<int:lesson_id>/complete/',
          mark_lesson_complete, name='lesson-complete'),
+    path('<int:course_id>/lessons/complete/',
+         mark_lessons_complete, name='lessons-complete-batch'),
+    path('<int:course_id>/lessons/<int:lesson_id>/heartbeat/',
+         lesson_heartbeat, name='lesson-heartbeat'),
+    path('<int:course_id>/progress/sync/', sync_progress, name='progress-sync'),
 
      # Creator view: see progress of all learners for a course
      path('<int:course_id>/progress/', CourseProgressList.as_view(), name='course-progress'),
+     path('<int:course_id>/progress/matrix/', CourseProgressMatrix.as_view(), name='course-progress-matrix'),
+     path('<int:course_id>/progress/export/', export_course_progress, name='course-progress-export'),
 
     # Certificates
     path('<int:enrollment_id>/certificate/issue/',
          issue_certificate, name='certificate-issue'),
+    path('<int:course_id>/certificates/issue/',
+         issue_course_certificates_view, name='course-certificates-issue'),
+    # Verify many serial hashes in one request
+    path('certificate/verify/', verify_certificates_bulk, name='certificate-verify-bulk'),
     path('certificate/verify/<str:serial_hash>/',
          CertificateVerifyView.as_view(), name='certificate-verify'),
+    # Stateless verification of a signed token (no database access)
+    path('certificate/token/<str:token>/',
+         verify_certificate_token_view, name='certificate-token-verify'),
     # Public render (printable) certificate view
     path('certificate/render/<str:serial_hash>/',
         render_certificate, name='certificate-render'),
     # PDF render endpoint
     path('certificate/pdf/<str:serial_hash>/', render_certificate_pdf, name='certificate-pdf'),
+    # Admin: ZIP of certificate PDFs (filter by course / issue date)
+    path('certificate/archive/', certificate_archive, name='certificate-archive'),
 ]
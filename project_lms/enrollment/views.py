@@ -1,43 +1,91 @@
+from django.db.models import Prefetch, Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied, ValidationError
-
-from .models import Enrollment, LessonProgress, Certificate
-from .serializers import EnrollmentSerializer, LessonProgressSerializer, CertificateSerializer
-from courses.models import Course
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.utils.urls import replace_query_param
+from core.aggregates import GroupConcat
+from core.pagination import CursorEnvelopePagination
+from core.views import SparseFieldsQuerysetMixin
+
+from .models import (
+    Enrollment, LessonProgress, Certificate, certificate_html_cache_key, certificate_verify_cache_key
+)
+from .serializers import (
+    EnrollmentSerializer, LessonProgressSerializer, CertificateSerializer, LessonCompletionBatchSerializer,
+    ProgressSyncSerializer, LessonHeartbeatSerializer, CertificateBulkVerifySerializer
+)
+from .heartbeats import record_heartbeat
+from .tokens import InvalidCertificateToken, verify_certificate_token
+from .exports import EXPORT_FORMATS, EXPORT_KINDS, stream_export
+from .progress import (
+    record_lesson_completion, record_lesson_completions, complete_enrollment_if_finished, compact_progress_enabled,
+    apply_progress_events, issue_course_certificates
+)
+from courses.models import Course, Lesson
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from django.template.loader import render_to_string
-from django.http import HttpResponse
-import io
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.core.cache import cache
+from django.utils.http import http_date
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+import hashlib
 import logging
-try:
-    # ReportLab used for server-side PDF generation
-    from reportlab.lib.pagesizes import landscape, A4
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.colors import HexColor
-    REPORTLAB_AVAILABLE = True
-except Exception:
-    REPORTLAB_AVAILABLE = False
+import os
+from .pdf import (
+    REPORTLAB_AVAILABLE, certificate_fingerprint, get_cached_pdf, certificate_data_rows, iter_certificate_archive
+)
+from admin_panel.permissions import IsAdmin
 
 class IsLearner(permissions.BasePermission):
     """Custom permission to only allow Learners to access enrollment features."""
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.is_learner()
 
-class EnrollmentListCreateView(generics.ListCreateAPIView):
+def enrollment_queryset(user, excluded=()):
+    """
+    Enrollments of `user` with everything EnrollmentSerializer reads loaded up
+    front, so a page costs a fixed number of queries regardless of its size.
+    Related rows behind `excluded` serializer fields are not loaded.
+    """
+    qs = Enrollment.objects.filter(learner=user).select_related('course', 'learner')
+    if 'certificate' not in excluded:
+        qs = qs.select_related('certificate')
+    if 'completed_lessons' in excluded:
+        return qs.defer('progress_bitmap', 'progress_timestamps')
+    if compact_progress_enabled():
+        return qs.prefetch_related(
+            Prefetch('course__lessons', queryset=Lesson.objects.only('id', 'course_id', 'progress_slot'))
+        )
+    return qs.prefetch_related(
+        Prefetch(
+            'lesson_progress',
+            queryset=LessonProgress.objects.filter(is_completed=True).only('id', 'enrollment_id', 'lesson_id'),
+            to_attr='completed_progress'
+        )
+    )
+
+class EnrollmentCursorPagination(CursorEnvelopePagination):
+    ordering = ('-enrolled_at', '-id')
+
+
+class EnrollmentListCreateView(SparseFieldsQuerysetMixin, generics.ListCreateAPIView):
     """
     List user's enrollments or create a new enrollment.
-    Learners only.
+    Learners only. Reads accept `?fields=`/`?omit=`.
     """
     serializer_class = EnrollmentSerializer
     permission_classes = [permissions.IsAuthenticated, IsLearner]
+    pagination_class = EnrollmentCursorPagination
+    deferrable_fields = {'certificate': (), 'completed_lessons': ()}
 
     def get_queryset(self):
-        return Enrollment.objects.filter(learner=self.request.user)
+        return enrollment_queryset(self.request.user, excluded=self.excluded_fields())
 
     def perform_create(self, serializer):
         try:
@@ -54,15 +102,16 @@ class EnrollmentListCreateView(generics.ListCreateAPIView):
         if course.status != Course.STATUS_PUBLISHED and course.creator.role != settings.ROLE_CREATOR:
             raise ValidationError({'course': 'Cannot enroll in an unpublished course.'})
 
-        serializer.save(learner=self.request.user)
+        serializer.save(learner=self.request.user, total_lessons_snapshot=course.lesson_count)
 
-class EnrollmentDetailView(generics.RetrieveAPIView):
-    """Retrieve a single enrollment detail."""
+class EnrollmentDetailView(SparseFieldsQuerysetMixin, generics.RetrieveAPIView):
+    """Retrieve a single enrollment detail. Accepts `?fields=`/`?omit=`."""
     serializer_class = EnrollmentSerializer
     permission_classes = [permissions.IsAuthenticated, IsLearner]
+    deferrable_fields = {'certificate': (), 'completed_lessons': ()}
 
     def get_queryset(self):
-        return Enrollment.objects.filter(learner=self.request.user)
+        return enrollment_queryset(self.request.user, excluded=self.excluded_fields())
 
 # --- Lesson Progress & Completion ---
 
@@ -76,47 +125,113 @@ def mark_lesson_complete(request, course_id, lesson_id):
     enrollment = get_object_or_404(Enrollment, learner=request.user, course=course)
     lesson = get_object_or_404(course.lessons, pk=lesson_id) # Ensure lesson belongs to the course
 
-    # Get or create the progress record
-    progress, created = LessonProgress.objects.get_or_create(
-        enrollment=enrollment,
-        lesson=lesson,
-        defaults={'is_completed': True, 'completed_at': timezone.now()}
+    progress, newly_completed = record_lesson_completion(enrollment, lesson)
+    if not newly_completed:
+        return Response({'message': 'Lesson already marked as complete.'}, status=status.HTTP_200_OK)
+
+    # Check for course completion using the denormalized counters (no COUNT queries)
+    if complete_enrollment_if_finished(enrollment):
+        message = 'Lesson marked complete. Course also completed! Certificate issued.'
+    else:
+        message = 'Lesson marked complete.'
+
+    certificate = getattr(enrollment, 'certificate', None) if enrollment.is_completed else None
+    return Response(
+        {'message': message, 'progress': LessonProgressSerializer(progress).data, 'certificate': CertificateSerializer(certificate).data if certificate else None},
+        status=status.HTTP_200_OK
     )
 
-    if not created and progress.is_completed:
-        return Response({'message': 'Lesson already marked as complete.'}, status=status.HTTP_200_OK)
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated, IsLearner])
+def mark_lessons_complete(request, course_id):
+    """
+    Mark several lessons of an enrolled course as complete in one request.
+    Body: {"lesson_ids": [1, 2, 3]}. Returns a status per lesson.
+    """
+    payload = LessonCompletionBatchSerializer(data=request.data)
+    payload.is_valid(raise_exception=True)
+    # Drop duplicates but keep the client's ordering for the response
+    lesson_ids = list(dict.fromkeys(payload.validated_data['lesson_ids']))
+
+    enrollment = get_object_or_404(Enrollment, learner=request.user, course_id=course_id)
+    valid_ids = set(
+        Lesson.objects.filter(course_id=course_id, pk__in=lesson_ids).values_list('id', flat=True)
+    )
 
-    # If it was created, or if it wasn't completed before
-    if not progress.is_completed:
-        progress.is_completed = True
-        progress.completed_at = timezone.now()
-        progress.save()
-
-    # Check for course completion
-    total_lessons = course.lessons.count()
-    completed_lessons = enrollment.lesson_progress.filter(is_completed=True).count()
-
-    if total_lessons > 0 and completed_lessons == total_lessons and not enrollment.is_completed:
-        enrollment.is_completed = True
-        enrollment.completion_date = timezone.now()
-        enrollment.save()
-        # Auto-issue certificate
-        certificate = None
-        if not hasattr(enrollment, 'certificate'):
-            certificate = Certificate.objects.create(enrollment=enrollment)
-            certificate.save()
+    now = timezone.now()
+    newly_completed = record_lesson_completions(
+        enrollment, {lesson_id: now for lesson_id in lesson_ids if lesson_id in valid_ids}
+    )
+    course_completed = complete_enrollment_if_finished(enrollment)
+
+    results = []
+    for lesson_id in lesson_ids:
+        if lesson_id not in valid_ids:
+            result = 'not_found'
+        elif lesson_id in newly_completed:
+            result = 'completed'
         else:
-            certificate = enrollment.certificate
+            result = 'already_completed'
+        results.append({'lesson_id': lesson_id, 'status': result})
 
-        message = 'Lesson marked complete. Course also completed! Certificate issued.'
+    if course_completed:
+        message = 'Lessons marked complete. Course also completed! Certificate issued.'
     else:
-        message = 'Lesson marked complete.'
+        message = f'{len(newly_completed)} lesson(s) marked complete.'
+
+    certificate = getattr(enrollment, 'certificate', None) if enrollment.is_completed else None
+    return Response(
+        {'message': message, 'results': results, 'certificate': CertificateSerializer(certificate).data if certificate else None},
+        status=status.HTTP_200_OK
+    )
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated, IsLearner])
+def sync_progress(request, course_id):
+    """
+    Replay progress events a client collected offline.
+    Body: {"events": [{"event_id": 1, "lesson_id": 3, "occurred_at": "..."}]}
+    Event ids must increase; ids at or below the stored high-water mark are
+    ignored, so a batch can be resent safely. Responds with the server's
+    authoritative enrollment state for the client to reconcile against.
+    """
+    payload = ProgressSyncSerializer(data=request.data)
+    payload.is_valid(raise_exception=True)
 
+    enrollment = get_object_or_404(Enrollment, learner=request.user, course_id=course_id)
+    outcome = apply_progress_events(enrollment, payload.validated_data['events'])
+    complete_enrollment_if_finished(enrollment)
+
+    enrollment = get_object_or_404(enrollment_queryset(request.user), pk=enrollment.pk)
     return Response(
-        {'message': message, 'progress': LessonProgressSerializer(progress).data, 'certificate': CertificateSerializer(certificate).data if enrollment.is_completed else None},
+        {
+            **outcome,
+            'high_water_mark': enrollment.sync_high_water_mark,
+            'enrollment': EnrollmentSerializer(enrollment).data,
+        },
         status=status.HTTP_200_OK
     )
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated, IsLearner])
+def lesson_heartbeat(request, course_id, lesson_id):
+    """
+    Report the current position inside a lesson. Positions are buffered and
+    only the latest one per lesson is written to LessonProgress on flush.
+    """
+    payload = LessonHeartbeatSerializer(data=request.data)
+    payload.is_valid(raise_exception=True)
+
+    # One query checks both the enrollment and that the lesson belongs to the course
+    enrollment_id = Enrollment.objects.filter(
+        learner=request.user, course_id=course_id, course__lessons__id=lesson_id
+    ).values_list('pk', flat=True).first()
+    if enrollment_id is None:
+        raise NotFound('Not enrolled in this course, or the lesson does not belong to it.')
+
+    record_heartbeat(enrollment_id, lesson_id, payload.validated_data['position'])
+    return Response({'position': payload.validated_data['position']}, status=status.HTTP_202_ACCEPTED)
+
 # --- Certificate Issuance and Verification ---
 
 @api_view(['POST'])
@@ -125,7 +240,10 @@ def issue_certificate(request, enrollment_id):
     """
     Issue a certificate for a completed enrollment.
     """
-    enrollment = get_object_or_404(Enrollment, pk=enrollment_id, learner=request.user)
+    enrollment = get_object_or_404(
+        Enrollment.objects.select_related('learner', 'course__creator', 'certificate'),
+        pk=enrollment_id, learner=request.user
+    )
 
     if not enrollment.is_completed:
         return Response(
@@ -140,67 +258,153 @@ def issue_certificate(request, enrollment_id):
             status=status.HTTP_200_OK
         )
 
-    # Issue new certificate
+    # Issue new certificate (display fields and hash are filled in before the INSERT)
     certificate = Certificate.objects.create(enrollment=enrollment)
-    # The hash generation happens in the model's save method
-    certificate.save()
 
     return Response(
         {'message': 'Certificate issued successfully!', 'certificate': CertificateSerializer(certificate).data},
         status=status.HTTP_201_CREATED
     )
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def issue_course_certificates_view(request, course_id):
+    """
+    Issue certificates for every completed enrollment of a course that does not
+    have one yet. Creator of the course or admin only.
+    """
+    course = get_object_or_404(Course, pk=course_id)
+    if not (course.creator_id == request.user.id or request.user.is_admin()):
+        raise PermissionDenied('You do not have permission to issue certificates for this course.')
+
+    issued = issue_course_certificates(course.pk)
+    return Response(
+        {'message': f'{issued} certificate(s) issued.', 'course_id': course.pk, 'issued': issued},
+        status=status.HTTP_200_OK
+    )
+
 class CertificateVerifyView(generics.RetrieveAPIView):
     """
     Public endpoint to verify a certificate using its SHA256 serial hash.
+    Positive results are cached per hash (invalidated when the certificate
+    changes) and marked public so a CDN/reverse proxy can serve repeats.
     """
-    queryset = Certificate.objects.all()
+    queryset = Certificate.objects.select_related('enrollment__learner', 'enrollment__course')
     serializer_class = CertificateSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = 'serial_hash'
 
     def get(self, request, *args, **kwargs):
-        try:
-            certificate = self.get_object()
-        except Certificate.DoesNotExist:
-            return Response({'is_valid': False, 'message': 'Certificate hash not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-        # Re-verify the hash to ensure integrity
-        # Note: The issued_at time might be slightly different on re-creation,
-        # so this is a simplified check. In production, the save() method ensures
-        # the hash is stored correctly once.
-        if certificate.serial_hash == certificate.generate_serial_hash():
-            return Response(
-                {
-                    'is_valid': True,
-                    'message': 'Certificate verified successfully.',
-                    'certificate': self.get_serializer(certificate).data
-                },
-                status=status.HTTP_200_OK
-            )
+        key = certificate_verify_cache_key(kwargs[self.lookup_field])
+        data = cache.get(key)
+        if data is None:
+            try:
+                certificate = self.get_object()
+            except Http404:
+                return Response({'is_valid': False, 'message': 'Certificate hash not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+            # Re-verify the hash to ensure integrity
+            if certificate.serial_hash != certificate.generate_serial_hash():
+                # Should rarely happen unless data is tampered with
+                return Response({'is_valid': False, 'message': 'Certificate data integrity compromised.'}, status=status.HTTP_400_BAD_REQUEST)
+
+            data = {
+                'is_valid': True,
+                'message': 'Certificate verified successfully.',
+                'certificate': self.get_serializer(certificate).data
+            }
+            cache.set(key, data, timeout=settings.CERTIFICATE_VERIFY_CACHE_TIMEOUT)
+
+        response = Response(data, status=status.HTTP_200_OK)
+        patch_cache_control(response, public=True, max_age=settings.CERTIFICATE_CACHE_MAX_AGE)
+        return response
+
+
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def verify_certificates_bulk(request):
+    """
+    Verify up to 500 serial hashes at once: `{"serial_hashes": [...]}`.
+    All certificates are loaded in one query and re-hashed in memory; the
+    response maps every submitted hash to its verification result.
+    """
+    payload = CertificateBulkVerifySerializer(data=request.data)
+    payload.is_valid(raise_exception=True)
+    serial_hashes = list(dict.fromkeys(payload.validated_data['serial_hashes']))
+
+    certificates = {
+        certificate.serial_hash: certificate
+        for certificate in Certificate.objects.filter(serial_hash__in=serial_hashes).select_related(
+            'enrollment__learner', 'enrollment__course'
+        )
+    }
+    results = {}
+    for serial_hash in serial_hashes:
+        certificate = certificates.get(serial_hash)
+        if certificate is None:
+            results[serial_hash] = {'is_valid': False, 'message': 'Certificate hash not found.'}
+        elif certificate.serial_hash != certificate.generate_serial_hash():
+            results[serial_hash] = {'is_valid': False, 'message': 'Certificate data integrity compromised.'}
         else:
-             # Should rarely happen unless data is tampered with
-             return Response({'is_valid': False, 'message': 'Certificate data integrity compromised.'}, status=status.HTTP_400_BAD_REQUEST)
+            results[serial_hash] = {'is_valid': True, 'certificate': CertificateSerializer(certificate).data}
+
+    valid = sum(1 for result in results.values() if result['is_valid'])
+    return Response(
+        {'valid': valid, 'invalid': len(results) - valid, 'results': results},
+        status=status.HTTP_200_OK
+    )
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def verify_certificate_token_view(request, token):
+    """
+    Public, query-free verification of a signed certificate token. Checking
+    revocation requires the database-backed CertificateVerifyView.
+    """
+    try:
+        certificate = verify_certificate_token(token)
+    except InvalidCertificateToken as e:
+        return Response({'is_valid': False, 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = Response(
+        {'is_valid': True, 'message': 'Certificate token verified successfully.', 'certificate': certificate},
+        status=status.HTTP_200_OK
+    )
+    patch_cache_control(response, public=True, max_age=settings.CERTIFICATE_CACHE_MAX_AGE)
+    return response
 
 
 # Public render endpoint for printable certificates
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def render_certificate(request, serial_hash):
-    try:
-        certificate = Certificate.objects.get(serial_hash=serial_hash)
-    except Certificate.DoesNotExist:
-        # Try prefix match in case frontend passed a short id
-        try:
-            certificate = Certificate.objects.filter(serial_hash__startswith=serial_hash).first()
-            if not certificate:
-                return HttpResponse('Certificate not found', status=404)
-        except Exception:
+    """
+    Printable HTML certificate. The rendered page is cached with a strong ETag
+    per code and template version, so repeat and conditional requests are
+    answered without the template engine or the database.
+    """
+    key = certificate_html_cache_key(serial_hash)
+    cached = cache.get(key)
+    if cached is None:
+        # Accepts the full serial hash or the short code printed on the certificate
+        certificate = Certificate.objects.filter(**Certificate.code_lookup(serial_hash)).first()
+        if not certificate:
             return HttpResponse('Certificate not found', status=404)
 
-    # Render a simple HTML certificate template
-    html = render_to_string('enrollment/certificate.html', {'certificate': certificate})
-    return HttpResponse(html)
+        # Render a simple HTML certificate template
+        html = render_to_string('enrollment/certificate.html', {'certificate': certificate})
+        etag = '"%s"' % hashlib.sha256(html.encode('utf-8')).hexdigest()
+        cached = (etag, html)
+        cache.set(key, cached, timeout=settings.CERTIFICATE_HTML_CACHE_TIMEOUT)
+
+    etag, html = cached
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(html)
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.CERTIFICATE_CACHE_MAX_AGE)
+    return response
 
 
 @api_view(['GET'])
@@ -212,75 +416,68 @@ def render_certificate_pdf(request, serial_hash):
     """
     logger = logging.getLogger(__name__)
     logger.info(f"Certificate PDF requested: {serial_hash}")
-    try:
-        certificate = Certificate.objects.get(serial_hash=serial_hash)
-        logger.info("Exact match found for certificate")
-    except Certificate.DoesNotExist:
-        # Try prefix match to be tolerant of short ids
-        certificate = Certificate.objects.filter(serial_hash__startswith=serial_hash).first()
-        if not certificate:
-            logger.warning(f"Certificate not found for: {serial_hash}")
-            return HttpResponse('Certificate not found', status=404)
-        logger.info(f"Prefix match used for certificate: {certificate.serial_hash}")
+    certificate = Certificate.objects.filter(**Certificate.code_lookup(serial_hash)).first()
+    if not certificate:
+        logger.warning(f"Certificate not found for: {serial_hash}")
+        return HttpResponse('Certificate not found', status=404)
 
     if not REPORTLAB_AVAILABLE:
         # Fall back to HTML render
         html = render_to_string('enrollment/certificate.html', {'certificate': certificate})
         return HttpResponse(html)
 
-    # Create PDF
-    buffer = io.BytesIO()
-    page_size = landscape(A4)
-    c = canvas.Canvas(buffer, pagesize=page_size)
-    width, height = page_size
-
-    # Simple centered layout
-    accent = HexColor('#0ea5e9')
-    c.setFillColor(accent)
-    c.setFont('Times-Bold', 36)
-    c.drawCentredString(width/2, height - 100, certificate.title or 'Certificate of Completion')
-
-    c.setFillColor(HexColor('#111827'))
-    c.setFont('Times-Roman', 14)
-    c.drawCentredString(width/2, height - 140, 'This is to certify that')
-
-    # Recipient name
-    c.setFont('Times-Bold', 32)
-    c.drawCentredString(width/2, height - 190, certificate.recipient_name or '')
-
-    # Course title
-    c.setFont('Times-Roman', 16)
-    course_line = certificate.course_title or ''
-    if certificate.course_code:
-        course_line = f"{course_line} ({certificate.course_code})"
-    c.drawCentredString(width/2, height - 230, f"has successfully completed the course: {course_line}")
-
-    # Meta block
-    c.setFont('Times-Roman', 12)
-    left_x = 80
-    right_x = width - 80
-    c.drawString(left_x, height - 300, f"Date of completion: {certificate.issued_at.strftime('%B %d, %Y') if certificate.issued_at else ''}")
-    if certificate.duration_hours:
-        c.drawString(left_x, height - 320, f"Duration: {certificate.duration_hours}")
-    if certificate.grade:
-        c.drawString(left_x, height - 340, f"Achievement: {certificate.grade}")
-
-    c.drawRightString(right_x, height - 300, f"Issued by: {certificate.issuer_name}")
-    c.drawRightString(right_x, height - 320, f"Certificate ID: {certificate.serial_hash}")
-
-    # Signatures
-    sig_y = height - 420
-    c.line(left_x, sig_y, left_x + 220, sig_y)
-    c.drawString(left_x, sig_y - 14, certificate.signature_text or '(Signature) — Instructor')
-
-    c.line(right_x - 220, sig_y, right_x, sig_y)
-    c.drawString(right_x - 220, sig_y - 14, 'Director — Krishna')
-
-    c.showPage()
-    c.save()
-
-    buffer.seek(0)
-    return HttpResponse(buffer.getvalue(), content_type='application/pdf')
+    # The fingerprint covers the template version and every drawn field, so it
+    # is a valid strong validator and cache key
+    fingerprint = certificate_fingerprint(certificate)
+    pdf = get_cached_pdf(certificate, fingerprint)
+    last_modified = int(os.path.getmtime(pdf)) if isinstance(pdf, str) else int(certificate.issued_at.timestamp())
+
+    etag = f'"{fingerprint}"'
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    if isinstance(pdf, str):
+        response = FileResponse(open(pdf, 'rb'), content_type='application/pdf')
+    else:
+        response = HttpResponse(pdf, content_type='application/pdf')
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = f'public, max-age={settings.CERTIFICATE_CACHE_MAX_AGE}'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def certificate_archive(request):
+    """
+    Admin only: ZIP archive with the PDF of every certificate matching the
+    filters (`?course=<id>`, `?issued_after=` / `?issued_before=` dates),
+    rendered across worker processes and streamed as it is built.
+    """
+    if not REPORTLAB_AVAILABLE:
+        return Response({'error': 'PDF rendering is not available on this server.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    certificates = Certificate.objects.all()
+    course_id = request.query_params.get('course')
+    if course_id:
+        certificates = certificates.filter(enrollment__course_id=course_id)
+    try:
+        if request.query_params.get('issued_after'):
+            certificates = certificates.filter(issued_at__date__gte=request.query_params['issued_after'])
+        if request.query_params.get('issued_before'):
+            certificates = certificates.filter(issued_at__date__lte=request.query_params['issued_before'])
+    except DjangoValidationError:
+        raise ValidationError('issued_after and issued_before must be dates (YYYY-MM-DD).')
+    rows = certificate_data_rows(certificates)
+
+    response = StreamingHttpResponse(
+        iter_certificate_archive(rows, workers=settings.CERTIFICATE_ARCHIVE_WORKERS),
+        content_type='application/zip'
+    )
+    name = f"certificates-course-{course_id}.zip" if course_id else "certificates.zip"
+    response['Content-Disposition'] = f'attachment; filename="{name}"'
+    return response
 
 
 # --- Creator access to learner progress for a course ---
@@ -298,6 +495,8 @@ class CourseProgressList(generics.ListAPIView):
     """List all lesson progress records for a given course (creator/admin only)."""
     serializer_class = LessonProgressSerializer
     permission_classes = [IsAuthenticated]
+    # Keyset pages on the primary key, newest first
+    pagination_class = CursorEnvelopePagination
 
     def get_queryset(self):
         course_id = self.kwargs.get('course_id')
@@ -312,4 +511,90 @@ class CourseProgressList(generics.ListAPIView):
         qs = LessonProgress.objects.filter(enrollment__course=course).select_related('enrollment', 'lesson')
         if learner_id:
             qs = qs.filter(enrollment__learner__id=learner_id)
-        return qs
\ No newline at end of file
+        return qs
+
+
+class CourseProgressMatrix(generics.GenericAPIView):
+    """
+    Class overview for creators: the course's lessons once, then one compact
+    completion vector per learner ('1' = lesson done, aligned with `lessons`).
+    Learners are paginated by enrollment id with `?cursor=<last id>`.
+    """
+    permission_classes = [IsAuthenticated]
+    default_page_size = 100
+    max_page_size = 500
+
+    def get(self, request, course_id):
+        course = get_object_or_404(Course, pk=course_id)
+        if not (course.creator_id == request.user.id or request.user.is_admin()):
+            raise PermissionDenied('You do not have permission to view progress for this course.')
+
+        try:
+            cursor = int(request.query_params.get('cursor', 0))
+            page_size = min(int(request.query_params.get('page_size', self.default_page_size)), self.max_page_size)
+        except ValueError:
+            raise ValidationError('cursor and page_size must be integers.')
+        page_size = max(page_size, 1)
+
+        lessons = list(course.lessons.values('id', 'title', 'order'))
+        positions = {lesson['id']: index for index, lesson in enumerate(lessons)}
+
+        # One grouped query: each learner row carries its completed lesson ids
+        rows = list(
+            Enrollment.objects.filter(course=course, pk__gt=cursor)
+            .order_by('pk')
+            .values('pk', 'learner_id', 'learner__username', 'is_completed')
+            .annotate(done=GroupConcat('lesson_progress__lesson_id', filter=Q(lesson_progress__is_completed=True)))
+            [:page_size + 1]
+        )
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        results = []
+        for row in rows:
+            vector = ['0'] * len(lessons)
+            for lesson_id in (row['done'] or '').split(','):
+                if lesson_id and int(lesson_id) in positions:
+                    vector[positions[int(lesson_id)]] = '1'
+            completed = vector.count('1')
+            results.append({
+                'enrollment_id': row['pk'],
+                'learner_id': row['learner_id'],
+                'learner_username': row['learner__username'],
+                'is_completed': row['is_completed'],
+                'completed': ''.join(vector),
+                'percent': round(100.0 * completed / len(lessons), 1) if lessons else 0.0,
+            })
+
+        next_link = None
+        if has_more:
+            next_link = replace_query_param(request.build_absolute_uri(), 'cursor', rows[-1]['pk'])
+        return Response({
+            'lessons': lessons,
+            'pagination': {'next': next_link, 'page_size': page_size},
+            'results': results,
+        })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_course_progress(request, course_id):
+    """
+    Stream a course's lesson progress (`?kind=progress`, default) or
+    enrollments (`?kind=enrollments`) as CSV (`?output=csv`, default) or NDJSON.
+    Creator of the course or admin only.
+    """
+    course = get_object_or_404(Course, pk=course_id)
+    if not (course.creator_id == request.user.id or request.user.is_admin()):
+        raise PermissionDenied('You do not have permission to export progress for this course.')
+
+    kind = request.query_params.get('kind', 'progress')
+    fmt = request.query_params.get('output', 'csv')
+    if kind not in EXPORT_KINDS or fmt not in EXPORT_FORMATS:
+        raise ValidationError(
+            f"kind must be one of {sorted(EXPORT_KINDS)} and output one of {sorted(EXPORT_FORMATS)}."
+        )
+
+    response = StreamingHttpResponse(stream_export(course.pk, kind, fmt), content_type=EXPORT_FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="course-{course.pk}-{kind}.{fmt}"'
+    return response
@@ -177,6 +177,9 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10, # Default page size for all paginated lists
 }
 
+# Lifetime (seconds) of the cached totals CursorEnvelopePagination returns for `?count=exact`
+PAGINATION_COUNT_CACHE_TIMEOUT = int(os.environ.get('PAGINATION_COUNT_CACHE_TIMEOUT', '60'))
+
 
 # Simple JWT Settings
 SIMPLE_JWT = {
@@ -215,10 +218,59 @@ if REDIS_URL:
     # Use Django cache for rate-limit/idempotency
     RATE_LIMIT_STORAGE = cache
     IDEMPOTENCY_CACHE = cache
+    # Shared buffer for lesson heartbeats, drained by `manage.py flush_heartbeats`
+    HEARTBEAT_BUFFER = cache
 else:
     # Simple in-memory storage for rate limiting and idempotency (dev/mock)
     RATE_LIMIT_STORAGE = {}
     IDEMPOTENCY_CACHE = {}
+    # In-process heartbeat buffer, flushed by the web process itself
+    HEARTBEAT_BUFFER = {}
+
+# Seconds between flushes of buffered lesson heartbeats into LessonProgress
+HEARTBEAT_FLUSH_INTERVAL = int(os.environ.get('HEARTBEAT_FLUSH_INTERVAL', '30'))
+
+# Compact lesson progress: keep a packed bitmap of completed lessons on each
+# Enrollment and read it instead of querying LessonProgress. Existing rows can be
+# folded in with `manage.py build_progress_bitmaps`.
+ENROLLMENT_COMPACT_PROGRESS = os.environ.get('ENROLLMENT_COMPACT_PROGRESS', 'False').lower() in ('1', 'true', 'yes')
+
+# Re-evaluate enrollment completion for the whole course (in bulk, after commit)
+# whenever LessonViewSet adds or removes a lesson.
+RECONCILE_COMPLETION_ON_LESSON_CHANGE = os.environ.get('RECONCILE_COMPLETION_ON_LESSON_CHANGE', 'False').lower() in ('1', 'true', 'yes')
+
+# Seconds a serialized course catalog page stays cached. Course, lesson and
+# user role changes invalidate it earlier, but only across workers through a
+# shared cache, so without Redis pages must expire quickly instead.
+COURSE_CATALOG_CACHE_TIMEOUT = int(os.environ.get('COURSE_CATALOG_CACHE_TIMEOUT', '300' if REDIS_URL else '60'))
+
+# Seconds a course's lesson funnel (creator dashboard) stays cached. The
+# refresh_lesson_funnels command clears changed courses, but it runs in its own
+# process and only reaches the web workers through a shared cache, so without
+# Redis funnels must expire quickly instead.
+FUNNEL_CACHE_TIMEOUT = int(os.environ.get('FUNNEL_CACHE_TIMEOUT', '300' if REDIS_URL else '60'))
+
+# Certificates
+# Bump CERTIFICATE_TEMPLATE_VERSION whenever the PDF/HTML layout changes so cached
+# renders are replaced. PDFs are cached on disk under CERTIFICATE_PDF_CACHE_DIR;
+# set it to an empty string to keep them in the cache backend instead.
+CERTIFICATE_TEMPLATE_VERSION = os.environ.get('CERTIFICATE_TEMPLATE_VERSION', '1')
+CERTIFICATE_PDF_CACHE_DIR = os.environ.get('CERTIFICATE_PDF_CACHE_DIR', str(BASE_DIR / 'cache' / 'certificates'))
+# Worker processes used to render certificate ZIP archives in a request
+CERTIFICATE_ARCHIVE_WORKERS = int(os.environ.get('CERTIFICATE_ARCHIVE_WORKERS', '2'))
+# Browser/CDN lifetime (seconds) of public certificate responses
+CERTIFICATE_CACHE_MAX_AGE = int(os.environ.get('CERTIFICATE_CACHE_MAX_AGE', '86400'))
+# HMAC key of the stateless certificate verification tokens (rotating it
+# invalidates every token issued so far)
+CERTIFICATE_TOKEN_KEY = os.environ.get('CERTIFICATE_TOKEN_KEY') or SECRET_KEY
+# Server-side lifetime of cached certificate data that signals invalidate on
+# change. Invalidation only reaches every worker through a shared cache, so
+# with the per-process default cache entries must expire quickly instead.
+_certificate_cache_timeout = 7 * 24 * 3600 if REDIS_URL else 60
+# Server-side cache lifetime (seconds) of positive certificate verifications
+CERTIFICATE_VERIFY_CACHE_TIMEOUT = int(os.environ.get('CERTIFICATE_VERIFY_CACHE_TIMEOUT', str(_certificate_cache_timeout)))
+# Server-side cache lifetime (seconds) of rendered HTML certificates
+CERTIFICATE_HTML_CACHE_TIMEOUT = int(os.environ.get('CERTIFICATE_HTML_CACHE_TIMEOUT', str(_certificate_cache_timeout)))
 
 # Roles
 ROLE_LEARNER = 1